@@ -0,0 +1,127 @@
+"""
+Compares refreshing the cache list by clearing and rebuilding it against the diff based
+listdiff.sync_items, at several list sizes.
+
+    python benchmarks/bench_list_refresh.py --sizes 100 1000 10000 --changed 0.01
+
+The list is a plain Python stand-in for the abc_files CollectionProperty, with a fixed cost
+per call to add(), remove() and every field write, standing in for the RNA round trip.
+"""
+import sys
+import time
+import argparse
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_assigner.core import naming
+from cache_assigner.core.listdiff import sync_items
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class Item:
+    __slots__ = ("_cost", "_fields")
+
+    def __init__(self, cost):
+        object.__setattr__(self, "_cost", cost)
+        object.__setattr__(self, "_fields", {"name": "", "display_name": "", "path": ""})
+
+    def __getattr__(self, name):
+        spin(self._cost)
+        return self._fields[name]
+
+    def __setattr__(self, name, value):
+        spin(self._cost)
+        self._fields[name] = value
+
+
+class Collection:
+    def __init__(self, cost):
+        self.cost = cost
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def add(self):
+        spin(self.cost)
+        item = Item(self.cost)
+        self.items.append(item)
+        return item
+
+    def remove(self, index):
+        spin(self.cost)
+        del self.items[index]
+
+    def clear(self):
+        spin(self.cost)
+        self.items = []
+
+
+def fill_item(item, file_path):
+    item.name = file_path.name
+    item.display_name = naming.nice_name(file_path.name)
+    item.path = str(file_path)
+
+
+def publish_paths(count, start=0):
+    return [
+        Path("/publish/animation", f"char{i % 50:03d}", f"v{i // 500 + 1:03d}",
+             f"tre_sh010_animationMain_3d_anim_char{i % 50:03d}_3d_rigging_rigMain_{i % 10:02d}__v{i // 500 + 1:03d}_{i:06d}.abc")
+        for i in range(start, start + count)
+    ]
+
+
+def rebuild(collection, paths):
+    collection.clear()
+    for file_path in paths:
+        fill_item(collection.add(), file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of the list replaced between refreshes")
+    parser.add_argument("--call-us", type=float, default=1.0, help="cost of each stand-in RNA call in microseconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cost = args.call_us / 1e6
+    print(f"{'entries':>8} {'changed':>8} {'rebuild':>10} {'diff':>10} {'speedup':>8}")
+    for size in args.sizes:
+        changed = max(1, int(size * args.changed))
+        before = publish_paths(size)
+        after = before[changed:] + publish_paths(changed, start=size)
+
+        def run_rebuild():
+            collection = Collection(cost)
+            rebuild(collection, before)
+            start = time.perf_counter()
+            rebuild(collection, after)
+            return time.perf_counter() - start
+
+        def run_diff():
+            collection = Collection(cost)
+            rebuild(collection, before)
+            start = time.perf_counter()
+            sync_items(collection, after, fill_item)
+            elapsed = time.perf_counter() - start
+            assert [item._fields["path"] for item in collection.items] == [str(path) for path in after]
+            return elapsed
+
+        rebuild_time = min(run_rebuild() for _ in range(args.repeat))
+        diff_time = min(run_diff() for _ in range(args.repeat))
+        print(f"{size:>8} {changed:>8} {rebuild_time:9.4f}s {diff_time:9.4f}s {rebuild_time / diff_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
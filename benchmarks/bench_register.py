@@ -0,0 +1,75 @@
+"""
+Times importing and registering the add-on, outside Blender through the bpy stand-in in
+fake_bpy.py, and lists the cache_assigner.core modules registration loaded.
+
+    python benchmarks/bench_register.py --repeat 20
+
+Every run is a fresh Python process, so nothing is already imported. The modules that only
+the optional features need (the folder watcher, Alembic header reader, metadata cache and
+prefetcher) must not be loaded by registration, the run exits with 1 if they are.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# loaded on first use, never by register()
+LAZY_MODULES = ("cache_assigner.core.watcher", "cache_assigner.core.archive", "cache_assigner.core.metadata", "cache_assigner.core.prefetch")
+
+
+def child():
+    sys.path.insert(0, str(HERE.parent))
+    sys.path.insert(0, str(HERE))
+    import fake_bpy
+
+    fake_bpy.install(tempfile.mkdtemp(prefix="cache_assigner_register_"))
+
+    start = time.perf_counter()
+    import cache_assigner
+    imported = time.perf_counter()
+    cache_assigner.register()
+    registered = time.perf_counter()
+
+    modules = sorted(name for name in sys.modules if name.startswith("cache_assigner.core."))
+    json.dump({"import": imported - start, "register": registered - imported, "modules": modules}, sys.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return 0
+
+    runs = []
+    for _ in range(args.repeat):
+        process = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, check=True)
+        runs.append(json.loads(process.stdout))
+
+    for stage in ("import", "register"):
+        times = [run[stage] * 1000 for run in runs]
+        print(f"{stage:<10} median {statistics.median(times):7.2f} ms   min {min(times):7.2f} ms")
+
+    modules = runs[-1]["modules"]
+    print(f"core modules loaded: {', '.join(name.rsplit('.', 1)[1] for name in modules)}")
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print(f"Loaded by register() but should load on first use: {', '.join(eager)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Benchmarks the scan, list and version code on generated OpenPype style publish trees, outside
+Blender through the bpy stand-in in fake_bpy.py.
+
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000
+    python benchmarks/bench_suite.py --save-baseline
+
+Each stage reports throughput and peak Python memory. Results are compared with the stored
+baselines (benchmarks/baselines.json) and the run exits with 1 if a stage got slower than
+--tolerance allows. Baselines are only comparable on the machine they were recorded on.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+
+import fake_bpy
+from bench_walker import build_publish_tree
+
+BASELINE_PATH = HERE / "baselines.json"
+
+
+def load_addon(cache_dir):
+    bpy = fake_bpy.install(cache_dir)
+
+    from cache_assigner import preferences, properties, ui, utils
+    from cache_assigner.core import naming
+    from cache_assigner.core.log import LoggerFactory
+
+    LoggerFactory.set_level("WARNING")
+    fake_bpy.install_preferences(bpy, preferences, cache_dir)
+    return bpy, properties, ui, utils, naming
+
+
+def measure(func, repeat):
+    """
+    Returns (best seconds, peak bytes, result). Memory is measured on a separate run, as tracing slows the code down.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def run_size(size, repeat, work_dir):
+    root = os.path.join(work_dir, f"publish_{size}", "animation")
+    cache_dir = os.path.join(work_dir, f"cache_{size}")
+    # 4 tasks of 10 files per version, with fewer assets for the small trees so there is more than one version
+    created = build_publish_tree(root, size, assets=min(50, max(1, size // 80)))
+
+    bpy, properties, ui, utils, naming = load_addon(cache_dir)
+    scene = bpy.context.scene
+    cacheProps = scene.CacheAssignerProperties
+
+    operator = properties.ScanForAlembicFiles()
+    operator.full_rescan = False
+
+    stages = {}
+
+    def record(name, func, items):
+        seconds, peak, result = measure(func, repeat)
+        stages[name] = {"seconds": seconds, "items": items, "per_second": items / seconds if seconds else 0.0, "peak_mb": peak / (1024 * 1024)}
+        return result
+
+    def cold_scan():
+        operator.full_rescan = True
+        cacheProps.abc_files.clear()
+        properties.ScanResults.clear()
+        operator.scan_for_abc_files(root, bpy.context)
+        operator.full_rescan = False
+
+    def warm_scan():
+        cacheProps.abc_files.clear()
+        operator.scan_for_abc_files(root, bpy.context)
+
+    record("scan_for_abc_files (cold index)", cold_scan, created)
+    record("scan_for_abc_files (warm index)", warm_scan, created)
+
+    files = list(properties.ScanResults.files)
+    names = [file_path.name for file_path in files]
+
+    record("get_latest_versions", lambda: properties.ScanForAlembicFiles.get_latest_versions(files), len(files))
+
+    def nice_names():
+        naming.parse_filename.cache_clear()
+        return [properties.ScanForAlembicFiles.extract_and_reorder_filename(name) for name in names]
+
+    record("extract_and_reorder_filename", nice_names, len(names))
+
+    checker = utils.VersionChecker(properties.ScanResults.version_index)
+    record("VersionChecker.compare_versions", lambda: [checker.compare_versions(name) for name in names], len(names))
+
+    # the panel's outdated check, with one loaded cache file per asset
+    oldest = {}
+    for file_path in files:
+        publish_name = naming.parse_path(file_path)
+        if publish_name and publish_name.version == 1:
+            oldest.setdefault(publish_name.asset, str(file_path))
+    bpy.data.cache_files[:] = [fake_bpy.CacheFile(f"{asset}.abc", path) for asset, path in oldest.items()]
+
+    def outdated_check():
+        ui.CacheInventory.clear()
+        ui.VersionStatus.key = None
+        return [ui.VersionStatus.get(scene, cache_file).is_outdated for cache_file in bpy.data.cache_files]
+
+    record("panel outdated check", outdated_check, len(bpy.data.cache_files))
+
+    # drop the add-on so the next size imports it against a fresh stand-in. The logger is
+    # kept, as importing it again would add a second handler to the same named logger
+    for module in [name for name in sys.modules if name == "cache_assigner" or name.startswith("cache_assigner.") and name != "cache_assigner.core.log"]:
+        del sys.modules[module]
+
+    return created, stages
+
+
+def compare(results, baselines, tolerance):
+    regressions = []
+    for size, stages in results.items():
+        for name, stage in stages.items():
+            baseline = baselines.get(size, {}).get(name)
+            if not baseline:
+                continue
+            ratio = stage["seconds"] / baseline["seconds"] if baseline["seconds"] else 1.0
+            stage["vs_baseline"] = ratio
+            if ratio > 1.0 + tolerance:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="how much slower than the baseline a stage may be")
+    parser.add_argument("--json", default=None, help="also write the results here")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="cache_assigner_suite_")
+    results = {}
+    try:
+        for size in args.sizes:
+            created, stages = run_size(size, args.repeat, work_dir)
+            results[str(size)] = stages
+            print(f"\n{created} files")
+            print(f"  {'stage':<34} {'seconds':>9} {'items/s':>12} {'peak MB':>9}")
+            for name, stage in stages.items():
+                print(f"  {name:<34} {stage['seconds']:9.4f} {stage['per_second']:12.0f} {stage['peak_mb']:9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baselines = json.load(baseline_file).get("results", {})
+
+    regressions = compare(results, baselines, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({"machine": platform.node(), "python": platform.python_version(), "results": baselines}, baseline_file, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        print("\nSlower than the baseline:")
+        for size, name, ratio in regressions:
+            print(f"  {size} files  {name}: {ratio:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
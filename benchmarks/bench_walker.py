@@ -0,0 +1,84 @@
+"""
+Compares the ParallelWalker scanner backend against Path.rglob on a generated publish tree.
+
+    python benchmarks/bench_walker.py --files 50000 --latency-ms 2
+
+--latency-ms adds a sleep to every directory listing to stand in for network storage,
+where a walk is bound by per-directory round trips rather than CPU.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_assigner.core.scanner import ParallelWalker
+
+
+def build_publish_tree(root, file_count, assets=50, tasks=4, files_per_version=10):
+    """
+    Builds an OpenPype style publish tree: asset / task / version / files.
+    """
+    versions = max(1, file_count // (assets * tasks * files_per_version))
+    created = 0
+    for a in range(assets):
+        for t in range(tasks):
+            for v in range(1, versions + 1):
+                folder = Path(root, f"char{a:03d}", f"animationMain{t:02d}", f"v{v:03d}")
+                folder.mkdir(parents=True, exist_ok=True)
+                for i in range(files_per_version):
+                    name = f"tre_sh010_animationMain{t:02d}_3d_anim_char{a:03d}_3d_rigging_rigMain_{i:02d}__v{v:03d}.abc"
+                    (folder / name).touch()
+                    created += 1
+    return created
+
+
+def add_latency(latency):
+    real_scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(latency)
+        return real_scandir(path)
+
+    os.scandir = slow_scandir
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    count = sum(1 for _ in func())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count:>8} files  {elapsed:8.3f}s  {count / elapsed:12.0f} files/s")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cache_assigner_bench_")
+    try:
+        created = build_publish_tree(root, args.files)
+        print(f"Generated {created} files under {root}")
+
+        if args.latency_ms:
+            add_latency(args.latency_ms / 1000.0)
+
+        expected = timed("Path.rglob", lambda: Path(root).rglob("*.abc"))
+        for workers in args.workers:
+            walker = ParallelWalker(workers=workers)
+            count = timed(f"ParallelWalker x{workers}", lambda: walker.iter_files(root))
+            assert count == expected, f"walker found {count} files, rglob found {expected}"
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
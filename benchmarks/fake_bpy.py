@@ -0,0 +1,230 @@
+"""
+A minimal stand-in for Blender's bpy module, just enough for the add-on's modules to import
+and for the scan, list and version code to run outside Blender. Nothing is drawn or registered.
+
+    import fake_bpy
+    bpy = fake_bpy.install(cache_dir)
+    from cache_assigner import properties
+"""
+import sys
+import types
+
+from itertools import count
+
+
+class Collection:
+    """
+    Stands in for a CollectionProperty: add(), remove(index), clear() and indexing.
+    """
+
+    def __init__(self, item_type):
+        self.item_type = item_type
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def add(self):
+        item = self.item_type()
+        self.items.append(item)
+        return item
+
+    def remove(self, index):
+        del self.items[index]
+
+    def clear(self):
+        self.items = []
+
+
+class AbcFileItem:
+    def __init__(self):
+        self.name = ""
+        self.display_name = ""
+        self.path = ""
+        self.has_metadata = False
+        self.frame_start = 0.0
+        self.frame_end = 0.0
+        self.is_static = False
+        self.object_count = 0
+        self.file_size_mb = 0.0
+        self.publish_time = ""
+
+
+class CacheAssignerProperties:
+    def __init__(self):
+        self.abc_files = Collection(AbcFileItem)
+        self.abc_file_index = -1
+        self.nice_name = False
+        self.latest_files_only = False
+
+
+class Scene:
+    def __init__(self, name="Scene"):
+        self.name = name
+        self.CacheAssignerProperties = CacheAssignerProperties()
+        self.render = types.SimpleNamespace(fps=24, fps_base=1.0)
+
+
+_pointers = count(1)
+
+
+class CacheFile:
+    def __init__(self, name, filepath):
+        self.name = name
+        self.filepath = filepath
+        self.library = None
+        self.use_fake_user = False
+        self._pointer = next(_pointers)
+
+    def as_pointer(self):
+        return self._pointer
+
+
+class NamedList(list):
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return super().__getitem__(key)
+
+
+class Base:
+    """
+    Base for every bpy.types class the add-on subclasses.
+    """
+    bl_rna = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def prop(*args, **kwargs):
+    return (args, kwargs)
+
+
+def persistent(func):
+    return func
+
+
+class Timers:
+    def __init__(self):
+        self.registered = set()
+
+    def register(self, func, first_interval=0.0, persistent=False):
+        self.registered.add(func)
+
+    def unregister(self, func):
+        self.registered.discard(func)
+
+    def is_registered(self, func):
+        return func in self.registered
+
+
+def install(cache_dir, scene=None):
+    """
+    Puts the stand-in into sys.modules as bpy and returns it. Must run before cache_assigner is imported.
+    """
+    bpy = types.ModuleType("bpy")
+    bpy_types = types.ModuleType("bpy.types")
+    bpy_props = types.ModuleType("bpy.props")
+    bpy_app = types.ModuleType("bpy.app")
+    bpy_handlers = types.ModuleType("bpy.app.handlers")
+
+    for name in ("Operator", "AddonPreferences", "PropertyGroup", "Panel", "UIList", "Context", "Menu"):
+        setattr(bpy_types, name, type(name, (Base,), {}))
+    bpy_types.CacheFile = CacheFile
+    bpy_types.Scene = Scene
+
+    for name in ("StringProperty", "IntProperty", "BoolProperty", "FloatProperty", "EnumProperty", "CollectionProperty", "PointerProperty"):
+        setattr(bpy_props, name, prop)
+
+    bpy_handlers.persistent = persistent
+    bpy_handlers.load_post = []
+    bpy_handlers.depsgraph_update_post = []
+    bpy_app.handlers = bpy_handlers
+    bpy_app.timers = Timers()
+
+    scene = scene or Scene()
+    bpy.types = bpy_types
+    bpy.props = bpy_props
+    bpy.app = bpy_app
+    bpy.data = types.SimpleNamespace(scenes=NamedList([scene]), cache_files=NamedList(), objects=NamedList(), filepath="")
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy.utils = types.SimpleNamespace(
+        register_class=lambda cls: register_class(bpy, cls, cache_dir),
+        unregister_class=lambda cls: None,
+        user_resource=lambda *args, **kwargs: cache_dir,
+    )
+    bpy.ops = types.SimpleNamespace()
+    bpy.context = types.SimpleNamespace(
+        scene=scene,
+        object=None,
+        preferences=types.SimpleNamespace(addons={}),
+        window_manager=types.SimpleNamespace(windows=[]),
+    )
+
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy_types
+    sys.modules["bpy.props"] = bpy_props
+    sys.modules["bpy.app"] = bpy_app
+    sys.modules["bpy.app.handlers"] = bpy_handlers
+    return bpy
+
+
+def register_class(bpy, cls, cache_dir):
+    # like Blender, registering the add-on preferences class creates its instance
+    if cls.__name__ == "CacheAssignerPreferences" and "cache_assigner" not in bpy.context.preferences.addons:
+        create_preferences(bpy, cls, cache_dir)
+
+
+def install_preferences(bpy, preferences_module, cache_dir, **overrides):
+    """
+    Gives the stand-in context a CacheAssignerPreferences with the add-on defaults, as preferences.get() expects.
+    """
+    return create_preferences(bpy, preferences_module.CacheAssignerPreferences, cache_dir, **overrides)
+
+
+def create_preferences(bpy, preferences_class, cache_dir, **overrides):
+    prefs = preferences_class()
+    defaults = {
+        "task_filter": "animation",
+        "naming_templates": "",
+        "nice_name_template": "",
+        "use_scan_index": True,
+        "background_scan": False,
+        "scan_workers": 8,
+        "scan_max_depth": 0,
+        "scan_exclude": "",
+        "load_metadata": False,
+        "metadata_cache_size": 5000,
+        "prefetch_newer_versions": False,
+        "prefetch_bandwidth": 0.0,
+        "list_page_size": 200,
+        "watch_publish_folder": False,
+        "watch_mode": "AUTO",
+        "watch_interval": 60.0,
+        "cache_dir": cache_dir,
+        "profiling": False,
+        "profile_buffer_size": 10000,
+        "debug_mode": False,
+    }
+    prefs.project_naming = Collection(types.SimpleNamespace)
+    defaults.update(overrides)
+    for name, value in defaults.items():
+        setattr(prefs, name, value)
+    bpy.context.preferences.addons["cache_assigner"] = types.SimpleNamespace(preferences=prefs)
+    return prefs
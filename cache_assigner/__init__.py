@@ -26,34 +26,48 @@ bl_info = {
     "category": "TheLine" 
 }
 
-if "bpy" in locals():
+# the Blender side of the add-on, in registration order. They are only imported when the
+# add-on is registered, so importing the package (or cache_assigner.core) doesn't need bpy
+BLENDER_MODULES = ("preferences", "properties", "inventory", "operators", "ui")
+
+# Blender's Reload Scripts runs this file again, the modules are then reloaded on the next register
+_reload_modules = "_modules" in locals()
+_modules = []
+
+def load_modules():
     import importlib
-    importlib.reload(preferences)
-    importlib.reload(properties)
-    importlib.reload(operators)
-    importlib.reload(ui)
-else:
-    import bpy
-    from . import preferences
-    from . import properties
-    from . import operators
-    from . import ui
+    global _reload_modules
+
+    modules = []
+    for name in BLENDER_MODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        if _reload_modules:
+            module = importlib.reload(module)
+        modules.append(module)
+    _reload_modules = False
+    return modules
 
 def register():
+    import bpy
+
+    _modules[:] = load_modules()
+    preferences, properties, inventory, operators, ui = _modules
 
     preferences.register()
     properties.register()
+    inventory.register()
     operators.register()
-    ui.register()
+    ui.register(bl_info["version"])
 
     prefs = preferences.get(bpy.context)
     prefs.update_logging_level()
+    prefs.update_naming(reparse=False)
+    prefs.update_profiling()
 
 def unregister():
-    ui.unregister()
-    operators.unregister()
-    properties.unregister()
-    preferences.unregister()
+    for module in reversed(_modules):
+        module.unregister()
+    _modules.clear()
 
 if __name__ == "__main__":
     register()
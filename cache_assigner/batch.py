@@ -0,0 +1,268 @@
+"""
+Retargets .blend files to the newest published caches without opening the UI.
+
+    python -m cache_assigner.batch shots/*.blend --blender /opt/blender/blender --jobs 4 --report report.json
+
+Every .blend is opened by its own background Blender process, several at a time, and each
+one runs the same scan, version and object matching code as the panel. The publish folder
+is worked out from the file's location like the pipeline's AVALON_WORKDIR, unless
+--publish-dir is given. Blender runs without the user's preferences, so a project with its
+own naming templates passes them with --naming-templates (or CACHE_ASSIGNER_NAMING_TEMPLATES).
+
+Files ending in .json are synthetic scene descriptions, processed in this process without
+Blender so the retargeting can be checked in CI:
+
+    {"cache_files": [{"name": "charBob.abc", "filepath": "/.../charBob_v001.abc", "objects": ["body_GEO"]}]}
+
+Inside Blender the same code is reached with
+
+    blender -b lighting.blend --python-expr "from cache_assigner import batch; batch.blender_main()" -- --result out.json
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .core import naming
+from .core import archive
+from .core import matching
+from .core.log import LoggerFactory
+from .core.scanner import ScanIndex, ParallelWalker
+from .core.shot_context import ShotContext
+from .core.versions import VersionIndex, find_updates
+
+logger = LoggerFactory.get_logger()
+
+DEFAULT_INDEX_DIR = os.path.join(tempfile.gettempdir(), "cache_assigner")
+
+# one scan per publish folder, however many files of the shot this process handles
+_version_indices = {}
+
+
+def configure_naming(templates):
+    """
+    Parses publish names with semicolon separated naming templates, like the add-on's
+    preference, so a batch run matches caches the way the panel does. Empty keeps the defaults.
+    """
+    naming.configure([template.strip() for template in (templates or "").split(";") if template.strip()])
+
+
+def publish_dir_for(file_path):
+    """
+    Returns the animation publish folder of the shot a workfile belongs to.
+    """
+    return ShotContext(work_dir=str(Path(file_path).resolve().parent)).anim_dir
+
+
+def get_version_index(publish_dir, index_dir=DEFAULT_INDEX_DIR, workers=8):
+    """
+    Scans a publish folder once and returns its VersionIndex. With an index_dir the scan goes
+    through the ScanIndex there, which the worker processes share.
+    """
+    if publish_dir not in _version_indices:
+        walker = ParallelWalker(workers=workers)
+        if index_dir:
+            files = ScanIndex(publish_dir, index_dir, walker=walker).scan()
+        else:
+            files = list(walker.iter_files(publish_dir))
+        _version_indices[publish_dir] = VersionIndex(files)
+    return _version_indices[publish_dir]
+
+
+def check_objects(file_path, object_names):
+    """
+    Matches object names against the hierarchy of a cache file, read from its headers.
+    """
+    try:
+        object_paths = archive.inspect(file_path)["object_paths"]
+    except (OSError, archive.AlembicReadError) as e:
+        return {"error": str(e)}
+
+    matched, ambiguous, unmatched = matching.match_objects(object_names, object_paths)
+    return {"matched": matched, "ambiguous": ambiguous, "unmatched": unmatched}
+
+
+def plan_changes(cache_files, version_index):
+    """
+    Takes dicts with a name, filepath and optionally objects and linked, and returns a change
+    for every one that has a newer version, with its objects matched against the new file.
+    """
+    objects = {cache_file["name"]: cache_file.get("objects", []) for cache_file in cache_files}
+    old_paths = {cache_file["name"]: cache_file["filepath"] for cache_file in cache_files if not cache_file.get("linked")}
+
+    changes = []
+    for name, old_version, new_version, new_path in find_updates(version_index, old_paths.items()):
+        changes.append({
+            "cache_file": name,
+            "old_path": old_paths[name],
+            "new_path": str(new_path),
+            "old_version": old_version,
+            "new_version": new_version,
+            "objects": check_objects(new_path, objects[name]) if objects[name] else {},
+        })
+    return changes
+
+
+def retarget_description(file_path, publish_dir=None, index_dir=DEFAULT_INDEX_DIR, save=True):
+    """
+    Retargets a synthetic scene description, a stand in for a .blend file that needs no Blender.
+    """
+    with open(file_path, "r", encoding="utf-8") as description_file:
+        description = json.load(description_file)
+
+    publish_dir = publish_dir or description.get("publish_dir") or publish_dir_for(file_path)
+    changes = plan_changes(description.get("cache_files", []), get_version_index(publish_dir, index_dir))
+
+    if changes and save:
+        new_paths = {change["cache_file"]: change["new_path"] for change in changes}
+        for cache_file in description["cache_files"]:
+            cache_file["filepath"] = new_paths.get(cache_file["name"], cache_file["filepath"])
+        with open(file_path, "w", encoding="utf-8") as description_file:
+            json.dump(description, description_file, indent=2)
+
+    return {"file": str(file_path), "publish_dir": publish_dir, "changes": changes, "saved": bool(changes and save)}
+
+
+def retarget_open_blend(publish_dir=None, index_dir=DEFAULT_INDEX_DIR, save=True):
+    """
+    Retargets the .blend file open in this Blender session. Every outdated local cache file
+    is pointed at its latest version and reloaded once, and objects whose path isn't in the
+    new file are remapped like the Load Alembic operator does.
+    """
+    import bpy
+    from . import utils
+
+    blend_path = bpy.data.filepath
+    publish_dir = publish_dir or publish_dir_for(blend_path)
+
+    # one pass over the objects, grouped by the cache file their modifier reads
+    modifiers = {}
+    for obj in bpy.data.objects:
+        for modifier in obj.modifiers:
+            if modifier.type == 'MESH_SEQUENCE_CACHE' and modifier.cache_file:
+                modifiers.setdefault(modifier.cache_file.name, []).append((obj.name, modifier))
+
+    cache_files = [
+        {
+            "name": cache_file.name,
+            "filepath": bpy.path.abspath(cache_file.filepath),
+            "linked": cache_file.library is not None,
+            "objects": [name for name, _ in modifiers.get(cache_file.name, [])],
+        }
+        for cache_file in bpy.data.cache_files
+    ]
+    changes = plan_changes(cache_files, get_version_index(publish_dir, index_dir))
+
+    for change in changes:
+        cache_file = bpy.data.cache_files[change["cache_file"]]
+        cache_file.filepath = change["new_path"]
+        utils.reload_cache_file(bpy.context, cache_file)
+
+        matched = change["objects"].get("matched", {})
+        for object_name, modifier in modifiers.get(cache_file.name, []):
+            path = matched.get(object_name)
+            if path and modifier.object_path != path:
+                modifier.object_path = path
+
+    if changes and save:
+        bpy.ops.wm.save_mainfile()
+
+    return {"file": blend_path, "publish_dir": publish_dir, "changes": changes, "saved": bool(changes and save)}
+
+
+def blender_main():
+    """
+    Entry point inside a background Blender process. Arguments come after "--".
+    """
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="cache_assigner.batch (in Blender)")
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--publish-dir", default=None)
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--naming-templates", default="")
+    args = parser.parse_args(argv)
+
+    configure_naming(args.naming_templates)
+    report = retarget_open_blend(args.publish_dir, args.index_dir or None, save=not args.no_save)
+    with open(args.result, "w", encoding="utf-8") as result_file:
+        json.dump(report, result_file)
+
+
+def run_in_blender(blend_path, blender, args):
+    """
+    Retargets one .blend file in a background Blender process and returns its report.
+    """
+    with tempfile.TemporaryDirectory(prefix="cache_assigner_batch_") as temp_dir:
+        result_path = os.path.join(temp_dir, "result.json")
+        package_parent = str(Path(__file__).resolve().parent.parent)
+        expression = f"import sys; sys.path.insert(0, {package_parent!r}); from cache_assigner import batch; batch.blender_main()"
+
+        command = [blender, "-b", str(blend_path), "--factory-startup", "--python-exit-code", "1", "--python-expr", expression, "--", "--result", result_path, "--index-dir", args.index_dir]
+        if args.publish_dir:
+            command += ["--publish-dir", args.publish_dir]
+        if args.no_save:
+            command.append("--no-save")
+        if args.naming_templates:
+            command += ["--naming-templates", args.naming_templates]
+
+        process = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        if process.returncode != 0 or not os.path.exists(result_path):
+            raise RuntimeError(f"Blender exited with {process.returncode}: {process.stderr.strip()[-2000:]}")
+
+        with open(result_path, "r", encoding="utf-8") as result_file:
+            return json.load(result_file)
+
+
+def process_file(file_path, args):
+    try:
+        if file_path.lower().endswith(".json"):
+            report = retarget_description(file_path, args.publish_dir, args.index_dir or None, save=not args.no_save)
+        else:
+            report = run_in_blender(file_path, args.blender, args)
+        report["status"] = "ok"
+    except Exception as e:
+        logger.error('Batch - %s failed: %s', file_path, e)
+        report = {"file": file_path, "status": "error", "error": str(e), "changes": []}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help=".blend files, or .json scene descriptions")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable for .blend files")
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Blender processes run at once")
+    parser.add_argument("--publish-dir", default=None, help="use this publish folder for every file")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR, help="scan index folder shared by the workers, empty to walk without one")
+    parser.add_argument("--report", required=True, help="where to write the JSON report")
+    parser.add_argument("--no-save", action="store_true", help="report the changes without saving the files")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds before a Blender process is given up on")
+    parser.add_argument("--naming-templates", default=os.environ.get("CACHE_ASSIGNER_NAMING_TEMPLATES", ""),
+                        help="semicolon separated naming templates, as in the add-on preferences. Blender runs with "
+                             "--factory-startup, so the project's templates have to be given here")
+    args = parser.parse_args(argv)
+
+    # before anything is scanned, the version index is built with these
+    configure_naming(args.naming_templates)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        reports = list(executor.map(lambda file_path: process_file(file_path, args), args.files))
+
+    failed = [report for report in reports if report["status"] != "ok"]
+    changed = sum(len(report["changes"]) for report in reports)
+    summary = {"files": len(reports), "failed": len(failed), "cache_files_updated": changed, "reports": reports}
+
+    with open(args.report, "w", encoding="utf-8") as report_file:
+        json.dump(summary, report_file, indent=2)
+
+    logger.info('Batch - %d files, %d cache files updated, %d failed', len(reports), changed, len(failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+The add-on's logic that doesn't need Blender: publish naming, version lookups, directory
+scanning, object path matching, Alembic header reading and the caches around them.
+Farm scripts and pipeline tools can import it without starting Blender.
+
+Submodules are imported the first time they are used, e.g. core.naming.
+"""
+import importlib
+
+SUBMODULES = (
+    "archive",
+    "listdiff",
+    "log",
+    "matching",
+    "metadata",
+    "naming",
+    "prefetch",
+    "profiling",
+    "scanner",
+    "search",
+    "shot_context",
+    "versions",
+    "watcher",
+)
+
+__all__ = list(SUBMODULES)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES))
@@ -0,0 +1,307 @@
+import os
+import sys
+import mmap
+import struct
+
+
+OGAWA_MAGIC = b"Ogawa"
+DATA_FLAG = 0x8000000000000000
+# Alembic marks acyclic time samplings with this time per cycle
+ACYCLIC_TIME_PER_CYCLE = sys.float_info.max / 32.0
+
+# children of the archive's root group
+ARCHIVE_VERSION_INDEX = 0
+FILE_VERSION_INDEX = 1
+TOP_OBJECT_INDEX = 2
+ARCHIVE_METADATA_INDEX = 3
+TIME_SAMPLINGS_INDEX = 4
+INDEXED_METADATA_INDEX = 5
+
+# object header data ends with two 16 byte hashes (data and children)
+OBJECT_HEADER_HASH_SIZE = 32
+
+
+class AlembicReadError(ValueError):
+    pass
+
+
+def parse_metadata(text):
+    """
+    Parses Alembic's serialized "key=value;key=value" metadata into a dict.
+    """
+    metadata = {}
+    for pair in text.split(";"):
+        key, sep, value = pair.partition("=")
+        if sep:
+            metadata[key] = value
+    return metadata
+
+
+class TimeSampling:
+    __slots__ = ("time_per_cycle", "sample_times", "max_samples")
+
+    def __init__(self, time_per_cycle, sample_times, max_samples):
+        self.time_per_cycle = time_per_cycle
+        self.sample_times = sample_times
+        self.max_samples = max_samples
+
+    @property
+    def is_acyclic(self):
+        return self.time_per_cycle == ACYCLIC_TIME_PER_CYCLE
+
+    def sample_time(self, index):
+        """
+        Returns the time in seconds of a sample index, the same way Alembic's TimeSampling does.
+        """
+        if self.is_acyclic:
+            return self.sample_times[min(index, len(self.sample_times) - 1)]
+        cycles, offset = divmod(index, len(self.sample_times))
+        return self.sample_times[offset] + cycles * self.time_per_cycle
+
+    def time_range(self):
+        """
+        Returns the (start, end) time in seconds covered by the samples written with this sampling,
+        or None if nothing was written with it.
+        """
+        if not self.max_samples or not self.sample_times:
+            return None
+        return self.sample_time(0), self.sample_time(self.max_samples - 1)
+
+
+class AlembicArchive:
+    """
+    A lightweight, read-only view of an Ogawa Alembic file.
+
+    Only the object hierarchy and the time sampling headers are read, through a memory map,
+    so object paths and frame ranges can be previewed without loading the archive into
+    Blender and without touching any of the sample data.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise AlembicReadError(f"{self.path} is empty")
+
+        try:
+            self._root = self.read_header()
+        except Exception:
+            self.close()
+            raise
+
+        self._indexed_metadata = None
+        self._time_samplings = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def read_header(self):
+        if len(self._map) < 16 or self._map[:5] != OGAWA_MAGIC:
+            raise AlembicReadError(f"{self.path} is not an Ogawa Alembic file")
+        root_pos, = struct.unpack_from("<Q", self._map, 8)
+        return self.read_group(root_pos)
+
+    def read_group(self, pos):
+        """
+        Returns the child entries of the group at pos. Each entry is a raw uint64 with
+        DATA_FLAG set for data children.
+        """
+        if pos == 0:
+            return ()
+        self.check_range(pos, 8)
+        count, = struct.unpack_from("<Q", self._map, pos)
+        self.check_range(pos + 8, count * 8)
+        return struct.unpack_from(f"<{count}Q", self._map, pos + 8)
+
+    def read_data(self, child):
+        """
+        Returns the bytes of a data child entry.
+        """
+        if not child & DATA_FLAG:
+            raise AlembicReadError(f"{self.path}: expected data, found a group")
+        pos = child & ~DATA_FLAG
+        if pos == 0:
+            return b""
+        self.check_range(pos, 8)
+        size, = struct.unpack_from("<Q", self._map, pos)
+        self.check_range(pos + 8, size)
+        return self._map[pos + 8:pos + 8 + size]
+
+    def check_range(self, pos, size):
+        if pos + size > len(self._map):
+            raise AlembicReadError(f"{self.path} is truncated or corrupt")
+
+    def root_child(self, index):
+        return self._root[index] if index < len(self._root) else None
+
+    def corrupt(self, error):
+        return AlembicReadError(f"{self.path} is truncated or corrupt ({error})")
+
+    @property
+    def archive_version(self):
+        try:
+            return struct.unpack("<i", self.read_data(self._root[ARCHIVE_VERSION_INDEX]))[0]
+        except (struct.error, IndexError) as e:
+            raise self.corrupt(e) from None
+
+    @property
+    def metadata(self):
+        child = self.root_child(ARCHIVE_METADATA_INDEX)
+        if child is None:
+            return {}
+        return parse_metadata(self.read_data(child).decode("utf-8", "replace"))
+
+    @property
+    def indexed_metadata(self):
+        """
+        Metadata strings that object headers refer to by index. Index 0 is always empty.
+        """
+        if self._indexed_metadata is None:
+            self._indexed_metadata = [""]
+            child = self.root_child(INDEXED_METADATA_INDEX)
+            buf = self.read_data(child) if child is not None else b""
+            pos = 0
+            while pos < len(buf):
+                size = buf[pos]
+                pos += 1
+                self._indexed_metadata.append(buf[pos:pos + size].decode("utf-8", "replace"))
+                pos += size
+        return self._indexed_metadata
+
+    @property
+    def time_samplings(self):
+        if self._time_samplings is None:
+            child = self.root_child(TIME_SAMPLINGS_INDEX)
+            buf = self.read_data(child) if child is not None else b""
+            time_samplings = []
+            pos = 0
+            try:
+                while pos < len(buf):
+                    max_samples, time_per_cycle, count = struct.unpack_from("<IdI", buf, pos)
+                    pos += 16
+                    sample_times = struct.unpack_from(f"<{count}d", buf, pos)
+                    pos += count * 8
+                    time_samplings.append(TimeSampling(time_per_cycle, sample_times, max_samples))
+            except struct.error as e:
+                raise self.corrupt(e) from None
+            self._time_samplings = time_samplings
+        return self._time_samplings
+
+    def time_range(self):
+        """
+        Returns the (start, end) time in seconds covered by every animated time sampling, or None
+        for a static archive. Sampling 0 is Alembic's default identity sampling and is only
+        counted when it holds more than one sample.
+        """
+        ranges = []
+        for time_sampling in self.time_samplings:
+            time_range = time_sampling.time_range() if time_sampling.max_samples > 1 else None
+            if time_range is not None:
+                ranges.append(time_range)
+        if not ranges:
+            return None
+        return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+    def frame_range(self, fps=None):
+        """
+        Returns the (start, end) frame range of the archive. fps defaults to the
+        FramesPerTimeUnit the exporter stored in the archive metadata, then 24.
+        """
+        time_range = self.time_range()
+        if time_range is None:
+            return None
+        if fps is None:
+            fps = float(self.metadata.get("FramesPerTimeUnit") or 24.0)
+        return round(time_range[0] * fps, 3), round(time_range[1] * fps, 3)
+
+    def read_object_headers(self, children, parent_path):
+        """
+        Returns (path, metadata) of every child object listed in an object group's header data.
+        """
+        if not children or not children[-1] & DATA_FLAG:
+            return []
+
+        buf = self.read_data(children[-1])
+        end = len(buf) - OBJECT_HEADER_HASH_SIZE
+        headers = []
+        pos = 0
+        try:
+            while pos < end:
+                name_size, = struct.unpack_from("<I", buf, pos)
+                pos += 4
+                name = buf[pos:pos + name_size].decode("utf-8", "replace")
+                pos += name_size
+                metadata_index = buf[pos]
+                pos += 1
+                if metadata_index == 0xff:
+                    metadata_size, = struct.unpack_from("<I", buf, pos)
+                    pos += 4
+                    metadata = buf[pos:pos + metadata_size].decode("utf-8", "replace")
+                    pos += metadata_size
+                elif metadata_index < len(self.indexed_metadata):
+                    metadata = self.indexed_metadata[metadata_index]
+                else:
+                    metadata = ""
+                headers.append((f"{parent_path}/{name}", metadata))
+        except (struct.error, IndexError) as e:
+            raise self.corrupt(e) from None
+        if pos > end:
+            raise self.corrupt("object headers overrun their hashes")
+        return headers
+
+    def iter_objects(self):
+        """
+        Yields (path, schema) for every object in the hierarchy, depth first with parents before
+        their children, in the order Blender lists them in CacheFile.object_paths.
+        """
+        top = self.root_child(TOP_OBJECT_INDEX)
+        if top is None or top & DATA_FLAG:
+            return
+        try:
+            yield from self.iter_children(top, "")
+        except RecursionError:
+            # a corrupt file whose groups point back at their parents
+            raise self.corrupt("the object hierarchy loops") from None
+
+    def iter_children(self, group, parent_path):
+        children = self.read_group(group)
+        for i, (path, metadata) in enumerate(self.read_object_headers(children, parent_path)):
+            yield path, parse_metadata(metadata).get("schema", "")
+
+            # child object i lives in group i + 1, group 0 holds the object's own properties
+            child = children[i + 1] if i + 1 < len(children) - 1 else None
+            if child and not child & DATA_FLAG:
+                yield from self.iter_children(child, path)
+
+    def object_paths(self):
+        return [path for path, _ in self.iter_objects()]
+
+
+def inspect(path, fps=None):
+    """
+    Returns a summary dict of an Alembic file: object paths, frame range and size.
+    Raises AlembicReadError for files that aren't Ogawa archives or are truncated or corrupt,
+    and OSError if it can't be read.
+    """
+    with AlembicArchive(path) as archive:
+        objects = list(archive.iter_objects())
+        return {
+            "path": str(path),
+            "size": os.path.getsize(path),
+            "object_paths": [object_path for object_path, _ in objects],
+            "schemas": dict(objects),
+            "frame_range": archive.frame_range(fps),
+            "metadata": archive.metadata,
+        }
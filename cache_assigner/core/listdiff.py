@@ -0,0 +1,41 @@
+def sync_items(collection, paths, fill_item):
+    """
+    Makes a collection of items with a path attribute (e.g. abc_files) hold exactly one item
+    per path, in place. Items whose path has gone are removed, missing paths are added at
+    the end through fill_item(item, path) and items that are still wanted aren't touched,
+    so a refresh costs one call per change instead of a full clear and rebuild.
+
+    Returns the number of items (added, removed).
+    """
+    wanted = {str(path): path for path in paths}
+
+    kept = set()
+    removed = 0
+    # back to front, so removing an item doesn't shift the ones still to be checked
+    for i in reversed(range(len(collection))):
+        path = collection[i].path
+        if path in wanted and path not in kept:
+            kept.add(path)
+        else:
+            collection.remove(i)
+            removed += 1
+
+    added = 0
+    for key, path in wanted.items():
+        if key not in kept:
+            fill_item(collection.add(), path)
+            added += 1
+
+    return added, removed
+
+
+def index_of(collection, path):
+    """
+    Returns the index of the item with the given path, or -1.
+    """
+    if path is None:
+        return -1
+    for i, item in enumerate(collection):
+        if item.path == path:
+            return i
+    return -1
@@ -0,0 +1,156 @@
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+
+from logging.handlers import QueueHandler, QueueListener
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops a record logged with extra={"rate_limit": seconds} when the same call site has
+    already logged within that many seconds, for messages from draw callbacks and timers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        interval = getattr(record, "rate_limit", None)
+        if not interval:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < interval:
+                return False
+            self._last[key] = now
+        return True
+
+
+class LoggerFactory:
+    """
+    A class to handle logging for the Blender addon.
+
+    Records go through a queue and are written to the console and any log files by a
+    listener thread, so a slow terminal or network log file never holds up the UI.
+    Messages are only formatted for records that pass the logger's level.
+    """
+
+    LOGGER_NAME = "CacheAssignerLogger"
+    FORMAT_DEFAULT = "[%(name)s][%(levelname)s] %(message)s"
+    LEVEL_DEFAULT = logging.INFO
+    PROPAGATE_DEFAULT = True
+    _logger_obj = None
+    _handlers = []
+    _listener = None
+    _queue = None
+
+    @classmethod
+    def get_logger(cls):
+        """
+        Returns the singleton logger object, creating it if necessary.
+        """
+        if cls._logger_obj is None:
+            cls._logger_obj = logging.getLogger(cls.LOGGER_NAME)
+            cls._logger_obj.setLevel(cls.LEVEL_DEFAULT)
+            cls._logger_obj.propagate = cls.PROPAGATE_DEFAULT
+
+            fmt = logging.Formatter(cls.FORMAT_DEFAULT)
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(fmt)
+            cls._handlers = [stream_handler]
+
+            cls._queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(cls._queue)
+            queue_handler.addFilter(RateLimitFilter())
+            cls._logger_obj.addHandler(queue_handler)
+            cls.start_listener()
+            atexit.register(cls.stop_listener)
+
+        return cls._logger_obj
+
+    @classmethod
+    def start_listener(cls):
+        """
+        Starts the thread writing queued records to the handlers.
+        """
+        if cls._listener is None:
+            cls._listener = QueueListener(cls._queue, *cls._handlers, respect_handler_level=True)
+            cls._listener.start()
+
+    @classmethod
+    def stop_listener(cls):
+        """
+        Writes out every queued record and stops the listener thread.
+        """
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+
+    @classmethod
+    def set_level(cls, level):
+        """
+        Sets the logging level of the logger.
+        """
+        logger = cls.get_logger()
+        logger.setLevel(level)
+        
+    @classmethod
+    def set_propagate(cls, propagate):
+        """
+        Sets the propagation property of the logger.
+        """
+        logger = cls.get_logger()
+        logger.propagate = propagate
+
+    @classmethod
+    def debug(cls, msg, *args, **kwargs):
+        cls.get_logger().debug(msg, *args, **kwargs)
+
+    @classmethod
+    def info(cls, msg, *args, **kwargs):
+        cls.get_logger().info(msg, *args, **kwargs)
+
+    @classmethod
+    def warning(cls, msg, *args, **kwargs):
+        cls.get_logger().warning(msg, *args, **kwargs)
+
+    @classmethod
+    def error(cls, msg, *args, **kwargs):
+        cls.get_logger().error(msg, *args, **kwargs)
+
+    @classmethod
+    def critical(cls, msg, *args, **kwargs):
+        cls.get_logger().critical(msg, *args, **kwargs)
+
+    @classmethod
+    def log(cls, level, msg, *args, **kwargs):
+        cls.get_logger().log(level, msg, *args, **kwargs)
+
+    @classmethod
+    def exception(cls, msg, *args, **kwargs):
+        cls.get_logger().exception(msg, *args, **kwargs)
+
+    @classmethod
+    def write_to_file(cls, path, level=logging.WARNING):
+        """
+        Writes log messages to a specified file.
+        """
+        file_handler = logging.FileHandler(path)
+        file_handler.setLevel(level)
+
+        fmt = logging.Formatter("[%(asctime)s][%(levelname)s] %(message)s")
+        file_handler.setFormatter(fmt)
+
+        cls.get_logger()
+        # the listener's handlers are fixed when it starts, so restart it with the new one
+        cls.stop_listener()
+        cls._handlers.append(file_handler)
+        cls.start_listener()
@@ -0,0 +1,75 @@
+import re
+
+from collections import defaultdict
+
+
+# Blender's duplicate suffix, e.g. body_GEO.001
+DUPLICATE_SUFFIX = re.compile(r"\.\d{3,}$")
+# Maya shape node suffixes, e.g. body_GEOShape, body_GEOShapeDeformed, body_GEOShapeOrig1
+SHAPE_SUFFIX = re.compile(r"(?<=.)Shape(?:Deformed|Orig)?\d*$")
+
+
+def normalise_name(name):
+    """
+    Reduces a Blender object name or an Alembic object path to the name both sides share:
+    the leaf, without namespaces, shape suffixes or Blender's .001 duplicate suffix.
+    """
+    leaf = name.rsplit("/", 1)[-1]
+    leaf = leaf.rsplit(":", 1)[-1]
+    leaf = DUPLICATE_SUFFIX.sub("", leaf)
+    return SHAPE_SUFFIX.sub("", leaf)
+
+
+class ObjectPathIndex:
+    """
+    A lookup from normalised leaf name to the full object paths of an Alembic hierarchy,
+    built once so matching every object in a collection is one dict lookup per object.
+    """
+
+    def __init__(self, object_paths):
+        self._paths = defaultdict(list)
+        for path in object_paths:
+            self._paths[normalise_name(path)].append(path)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def match(self, object_name):
+        """
+        Returns (path, candidates) for a Blender object name. path is None when nothing matches
+        or when the candidates sit on different branches of the hierarchy and can't be told apart.
+        """
+        candidates = self._paths.get(normalise_name(object_name))
+        if not candidates:
+            return None, []
+        if len(candidates) == 1:
+            return candidates[0], candidates
+
+        # a transform and its shape share a name. When every candidate is on one branch
+        # the deepest path wins, which is the shape the mesh modifier needs
+        deepest = max(candidates, key=len)
+        if all(deepest == path or deepest.startswith(path + "/") for path in candidates):
+            return deepest, candidates
+        return None, candidates
+
+
+def match_objects(object_names, object_paths):
+    """
+    Matches object names against an Alembic hierarchy.
+    Returns (matched, ambiguous, unmatched): name -> path, name -> candidate paths, and a list of names.
+    """
+    index = object_paths if isinstance(object_paths, ObjectPathIndex) else ObjectPathIndex(object_paths)
+
+    matched = {}
+    ambiguous = {}
+    unmatched = []
+    for name in object_names:
+        path, candidates = index.match(name)
+        if path:
+            matched[name] = path
+        elif candidates:
+            ambiguous[name] = candidates
+        else:
+            unmatched.append(name)
+
+    return matched, ambiguous, unmatched
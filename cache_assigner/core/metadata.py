@@ -0,0 +1,137 @@
+import os
+import json
+import hashlib
+import threading
+
+from pathlib import Path
+from collections import OrderedDict
+
+from . import archive
+from .log import LoggerFactory
+
+logger = LoggerFactory.get_logger()
+
+# bytes read from each end of a file for its sample hash
+HASH_SAMPLE_SIZE = 64 * 1024
+
+
+def sample_hash(path, size):
+    """
+    A cheap content fingerprint: the size plus the first and last 64 KB of the file.
+    Enough to tell publishes apart without streaming whole caches over the network.
+    """
+    digest = hashlib.blake2b(str(size).encode("utf-8"), digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read(HASH_SAMPLE_SIZE))
+        if size > HASH_SAMPLE_SIZE * 2:
+            f.seek(-HASH_SAMPLE_SIZE, os.SEEK_END)
+            digest.update(f.read(HASH_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+class MetadataCache:
+    """
+    Alembic file metadata (time range, object count, size and publish time), keyed by
+    (path, size, mtime) and stored as JSON in the local cache folder. A sample hash is only
+    added to an entry when fingerprint() asks for it.
+
+    A file that changes on disk gets a new size or mtime, so its stale entry is simply
+    recomputed. The least recently used entries are evicted once max_entries is reached.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir, max_entries=5000):
+        self.cache_path = Path(cache_dir) / "metadata.json"
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == self.CACHE_VERSION:
+            with self._lock:
+                self.entries = OrderedDict(data.get("entries", []))
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {"version": self.CACHE_VERSION, "entries": list(self.entries.items())}
+            self.dirty = False
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # a loader being cancelled can still be saving while the next one starts
+            temp_path = self.cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning('MetadataCache - Could not write %s: %s', self.cache_path, e)
+
+    def lookup(self, path, size, mtime):
+        """
+        Returns the stored entry for a file if its size and mtime still match, else None.
+        """
+        with self._lock:
+            entry = self.entries.get(path)
+            if entry is None or entry["size"] != size or entry["mtime"] != mtime:
+                return None
+            self.entries.move_to_end(path)
+            return entry
+
+    def store(self, path, entry):
+        with self._lock:
+            self.entries[path] = entry
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def get(self, path):
+        """
+        Returns the metadata of a file, reading its headers only when the cached entry is missing
+        or stale. Raises OSError if the file can't be read.
+        """
+        path = str(path)
+        stat = os.stat(path)
+        entry = self.lookup(path, stat.st_size, stat.st_mtime_ns)
+        if entry is not None:
+            return entry
+
+        entry = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "publish_time": stat.st_mtime,
+            "time_range": None,
+            "object_count": 0,
+        }
+        try:
+            with archive.AlembicArchive(path) as abc:
+                entry["time_range"] = abc.time_range()
+                entry["object_count"] = sum(1 for _ in abc.iter_objects())
+        except archive.AlembicReadError as e:
+            logger.debug('MetadataCache - No header data for %s: %s', path, e)
+
+        self.store(path, entry)
+        return entry
+
+    def fingerprint(self, path):
+        """
+        Returns the sample hash of a file, reading it only the first time it is asked for
+        at this size and mtime. Raises OSError if the file can't be read.
+        """
+        entry = self.get(path)
+        if "hash" not in entry:
+            fingerprint = sample_hash(str(path), entry["size"])
+            with self._lock:
+                entry["hash"] = fingerprint
+                self.dirty = True
+        return entry["hash"]
@@ -0,0 +1,223 @@
+import re
+
+from functools import lru_cache
+from pathlib import PurePath
+
+
+# Parse templates are tried in order and the first one that matches wins. In a template
+#   {field}           is any text
+#   {field:03d}       is a number, parsed as an int and padded like this when formatted
+#   {field:a|b}       is one of the listed choices
+#   *                 is any text that isn't kept
+# and everything else must match as it is written. {version} is always a number.
+DEFAULT_TEMPLATES = (
+    # the full publish name, e.g. tre_sh010_animationMain_3d_anim_charBob_3d_rigging_rigMain_01__v003.abc
+    "tre_sh*_{type}_{task:3d_anim|3d_layout}_{asset}_3d_rigging*_{item:02d}__v{version:03d}.{extension}",
+    # anything else that still carries a version, e.g. charBob_cache_v03.abc
+    "{base_name}_v{version:03d}.{extension}",
+)
+
+# the reordered name shown in the cache list
+DEFAULT_NICE_TEMPLATE = "{task}_{asset}_{item:02d}_{type}_v{version:03d}.{extension}"
+
+TOKEN = re.compile(r"\{(?P<field>\w+)(?::(?P<spec>[^}]*))?\}|(?P<wildcard>\*)")
+NUMBER_SPEC = re.compile(r"^0?\d*d$")
+
+
+class NamingTemplate:
+    """
+    A naming template compiled once into a regex for parsing and a format string for
+    formatting, e.g. "{task}_{asset}_{item:02d}__v{version:03d}.{extension}".
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.fields = []
+        self.numeric = set()
+
+        pattern = []
+        format_string = []
+        pos = 0
+        for token in TOKEN.finditer(template):
+            literal = template[pos:token.start()]
+            pattern.append(re.escape(literal))
+            format_string.append(literal.replace("{", "{{").replace("}", "}}"))
+            pos = token.end()
+
+            if token.group("wildcard"):
+                pattern.append(".*?")
+                continue
+
+            field, spec = token.group("field"), token.group("spec") or ""
+            if field in self.fields:
+                raise ValueError(f"{field} appears twice in naming template {template!r}")
+            self.fields.append(field)
+
+            if field == "version" or NUMBER_SPEC.match(spec):
+                self.numeric.add(field)
+                pattern.append(rf"(?P<{field}>\d+)")
+                format_string.append(f"{{{field}:{spec or 'd'}}}")
+            elif spec:
+                choices = "|".join(re.escape(choice) for choice in spec.split("|"))
+                pattern.append(rf"(?P<{field}>{choices})")
+                format_string.append(f"{{{field}}}")
+            else:
+                pattern.append(rf"(?P<{field}>.+?)")
+                format_string.append(f"{{{field}}}")
+
+        literal = template[pos:]
+        pattern.append(re.escape(literal))
+        format_string.append(literal.replace("{", "{{").replace("}", "}}"))
+
+        self.regex = re.compile("^" + "".join(pattern) + "$")
+        self.format_string = "".join(format_string)
+
+    def match(self, filename):
+        """
+        Returns the fields of a matching filename as a dict, or None.
+        """
+        match = self.regex.match(filename)
+        if not match:
+            return None
+        fields = match.groupdict()
+        for field in self.numeric:
+            fields[field] = int(fields[field])
+        fields["_version_span"] = match.span("version") if "version" in fields else None
+        return fields
+
+    def format(self, fields):
+        """
+        Formats fields with this template. Returns None if one of the fields is missing.
+        """
+        try:
+            return self.format_string.format(**fields)
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def __repr__(self):
+        return f"NamingTemplate({self.template!r})"
+
+
+class NamingConvention:
+    """
+    The parse templates and nice name template of a project, compiled once.
+    """
+
+    def __init__(self, templates=DEFAULT_TEMPLATES, nice_template=DEFAULT_NICE_TEMPLATE):
+        self.templates = [NamingTemplate(template) for template in templates]
+        self.nice_template = NamingTemplate(nice_template)
+
+    def parse(self, filename):
+        for template in self.templates:
+            fields = template.match(filename)
+            if fields is not None and fields["_version_span"] is not None:
+                return fields
+        return None
+
+
+@lru_cache(maxsize=32)
+def get_convention(templates=DEFAULT_TEMPLATES, nice_template=DEFAULT_NICE_TEMPLATE):
+    """
+    Returns the compiled NamingConvention for a set of templates, compiling each set only once.
+    """
+    return NamingConvention(templates, nice_template)
+
+
+_convention = get_convention()
+
+
+def configure(templates=DEFAULT_TEMPLATES, nice_template=DEFAULT_NICE_TEMPLATE):
+    """
+    Switches the naming convention every filename is parsed with. Returns True if it changed.
+    Raises ValueError for an invalid template.
+    """
+    global _convention
+    templates = tuple(templates) or DEFAULT_TEMPLATES
+    try:
+        convention = get_convention(templates, nice_template or DEFAULT_NICE_TEMPLATE)
+    except re.error as e:
+        raise ValueError(f"Invalid naming template: {e}")
+
+    if convention is _convention:
+        return False
+    _convention = convention
+    parse_filename.cache_clear()
+    return True
+
+
+class PublishName:
+    """
+    A publish filename broken into its parts. Only filename, base_name, version and extension
+    are guaranteed, the rest are None when the name's template doesn't have them.
+    """
+    __slots__ = ("filename", "base_name", "task", "asset", "item", "type", "version", "extension", "fields")
+
+    def __init__(self, filename, base_name, version, extension, task=None, asset=None, item=None, type=None, fields=None):
+        self.filename = filename
+        self.base_name = base_name
+        self.version = version
+        self.extension = extension
+        self.task = task
+        self.asset = asset
+        self.item = item
+        self.type = type
+        self.fields = fields or {}
+
+    @property
+    def nice_name(self):
+        """
+        The reordered name shown in the cache list, or the original filename if it can't be reordered.
+        """
+        return _convention.nice_template.format(self.fields) or self.filename
+
+    def __repr__(self):
+        return f"PublishName({self.filename!r})"
+
+
+@lru_cache(maxsize=65536)
+def parse_filename(filename):
+    """
+    Parses a publish filename (not a full path) once against the configured templates and
+    returns a PublishName, or None if the name carries no version. Results are memoized per filename.
+    """
+    fields = _convention.parse(filename)
+    if fields is None:
+        return None
+
+    # versions of one publish share everything but the version number
+    start, end = fields.pop("_version_span")
+    base_name = fields.get("base_name") or f"{filename[:start]}#{filename[end:]}"
+
+    return PublishName(
+        filename,
+        base_name,
+        fields["version"],
+        fields.get("extension") or PurePath(filename).suffix.lstrip("."),
+        task=fields.get("task"),
+        asset=fields.get("asset"),
+        item=fields.get("item"),
+        type=fields.get("type"),
+        fields=fields,
+    )
+
+
+def parse_path(path):
+    """
+    Parses the filename part of a path (str or Path).
+    """
+    return parse_filename(PurePath(path).name)
+
+
+def extract_version(filename):
+    """
+    Returns the version number of a publish filename. Raises ValueError if there isn't one.
+    """
+    publish_name = parse_filename(filename)
+    if publish_name is None:
+        raise ValueError("No version found in filename")
+    return publish_name.version
+
+
+def nice_name(filename):
+    publish_name = parse_filename(filename)
+    return publish_name.nice_name if publish_name else filename
@@ -0,0 +1,138 @@
+import os
+import time
+import queue
+import threading
+
+from .log import LoggerFactory
+
+logger = LoggerFactory.get_logger()
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class RateLimiter:
+    """
+    A token bucket capping reads to bytes_per_second, with up to one second of burst.
+    A rate of 0 means no cap.
+    """
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.tokens = bytes_per_second
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size, cancel_event=None):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= size or self.tokens >= self.rate:
+                    self.tokens -= size
+                    return
+                wait = (min(size, self.rate) - self.tokens) / self.rate
+            if cancel_event is not None and cancel_event.wait(wait):
+                return
+            elif cancel_event is None:
+                time.sleep(wait)
+
+
+def warm_file(path, limiter, cancel_event=None):
+    """
+    Pulls a file into the OS page cache so opening it later doesn't wait on the network.
+    Without a cap the kernel is asked to read it ahead, where it supports posix_fadvise;
+    otherwise the file is read sequentially and thrown away, at the limiter's rate.
+    Returns the number of bytes read.
+    """
+    with open(path, "rb", buffering=0) as cache_file:
+        fd = cache_file.fileno()
+        if hasattr(os, "posix_fadvise"):
+            if limiter.rate <= 0:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                return os.fstat(fd).st_size
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        read = 0
+        while cancel_event is None or not cancel_event.is_set():
+            limiter.consume(CHUNK_SIZE, cancel_event)
+            chunk = cache_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            read += len(chunk)
+        return read
+
+
+class Prefetcher:
+    """
+    Warms cache files on a worker thread, one at a time and within a bandwidth cap, so many
+    workstations spotting the same new publish don't all hit the file server at full speed.
+    Each file is only warmed once per size and mtime.
+    """
+
+    def __init__(self, bytes_per_second=0):
+        self.limiter = RateLimiter(bytes_per_second)
+        self.pending = queue.Queue()
+        self.warmed = {}
+        self._queued = set()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def set_rate(self, bytes_per_second):
+        self.limiter.rate = bytes_per_second
+
+    def request(self, paths):
+        """
+        Queues files to be warmed. Files already queued are skipped, and the worker skips the
+        ones already warmed and unchanged, so this never touches the disk itself.
+        """
+        for path in paths:
+            path = str(path)
+            with self._lock:
+                if path in self._queued:
+                    continue
+                self._queued.add(path)
+            self.pending.put(path)
+
+        if self._thread is None and not self.pending.empty():
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                path = self.pending.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                with self._lock:
+                    self._queued.discard(path)
+                continue
+            key = (stat.st_size, stat.st_mtime_ns)
+            if self.warmed.get(path) == key:
+                with self._lock:
+                    self._queued.discard(path)
+                continue
+
+            start = time.perf_counter()
+            try:
+                read = warm_file(path, self.limiter, self._stop)
+            except OSError as e:
+                logger.debug('Prefetcher - Could not warm %s: %s', path, e)
+                read = None
+
+            with self._lock:
+                self._queued.discard(path)
+                if read is not None and not self._stop.is_set():
+                    self.warmed[path] = key
+            if read is not None:
+                logger.debug('Prefetcher - Warmed %s, %.1f MB in %.1fs', path, read / (1024 * 1024), time.perf_counter() - start)
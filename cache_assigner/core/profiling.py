@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import threading
+
+from collections import deque
+from functools import wraps
+
+
+class Stage:
+    """
+    Times one run of a stage. Set items to record how many things it processed.
+    """
+    __slots__ = ("name", "items", "start")
+
+    def __init__(self, name, items=None):
+        self.name = name
+        self.items = items
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        Profiler.record(self.name, self.start, time.perf_counter() - self.start, self.items)
+        return False
+
+
+class NullStage:
+    """
+    Stands in for a Stage while profiling is off, so an instrumented call costs next to nothing.
+    """
+    __slots__ = ()
+    items = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_STAGE = NullStage()
+
+
+class Profiler:
+    """
+    Records the wall time, call count and item count of named stages (scan, draw, load...).
+    Every run goes into a ring buffer for tracing and into running totals per stage.
+    Off by default, switched on from the add-on preferences.
+    """
+    enabled = False
+    events = deque(maxlen=10000)
+    totals = {}
+    _lock = threading.Lock()
+    _origin = time.perf_counter()
+
+    @classmethod
+    def enable(cls, enabled=True, buffer_size=None):
+        cls.enabled = enabled
+        if buffer_size and buffer_size != cls.events.maxlen:
+            with cls._lock:
+                cls.events = deque(cls.events, maxlen=buffer_size)
+
+    @classmethod
+    def stage(cls, name, items=None):
+        """
+        Returns a context manager timing a stage:
+
+            with Profiler.stage("scan") as stage:
+                stage.items = len(files)
+        """
+        return Stage(name, items) if cls.enabled else NULL_STAGE
+
+    @classmethod
+    def timed(cls, name=None):
+        """
+        Decorator timing every call of a function as a stage, named after the function by default.
+        The wrapper takes *args, so don't use it on methods Blender registers (draw, execute,
+        poll...), Blender rejects those when their argument count doesn't match.
+        """
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return func(*args, **kwargs)
+                with Stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @classmethod
+    def record(cls, name, start, duration, items=None):
+        with cls._lock:
+            cls.events.append((name, start - cls._origin, duration, items, threading.get_ident()))
+            total = cls.totals.get(name)
+            if total is None:
+                total = cls.totals[name] = {"calls": 0, "total": 0.0, "max": 0.0, "items": 0}
+            total["calls"] += 1
+            total["total"] += duration
+            total["max"] = max(total["max"], duration)
+            if items:
+                total["items"] += items
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls.events.clear()
+            cls.totals = {}
+
+    @classmethod
+    def summary(cls):
+        """
+        Returns (name, calls, total seconds, mean seconds, max seconds, items) per stage, slowest total first.
+        """
+        with cls._lock:
+            totals = [(name, dict(total)) for name, total in cls.totals.items()]
+        rows = [
+            (name, total["calls"], total["total"], total["total"] / total["calls"], total["max"], total["items"])
+            for name, total in totals
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    @classmethod
+    def export_json(cls, path):
+        with cls._lock:
+            events = list(cls.events)
+        data = {
+            "stages": [
+                {"name": name, "calls": calls, "total": total, "mean": mean, "max": longest, "items": items}
+                for name, calls, total, mean, longest, items in cls.summary()
+            ],
+            "events": [
+                {"name": name, "start": start, "duration": duration, "items": items, "thread": thread}
+                for name, start, duration, items, thread in events
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as export_file:
+            json.dump(data, export_file, indent=2)
+
+    @classmethod
+    def export_chrome_trace(cls, path):
+        """
+        Writes the ring buffer in the Trace Event format, for chrome://tracing or Perfetto.
+        """
+        with cls._lock:
+            events = list(cls.events)
+        pid = os.getpid()
+        trace = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": thread,
+                "args": {"items": items} if items is not None else {},
+            }
+            for name, start, duration, items, thread in events
+        ]
+        with open(path, "w", encoding="utf-8") as export_file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, export_file)
@@ -0,0 +1,205 @@
+import os
+import json
+import hashlib
+import threading
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .log import LoggerFactory
+
+logger = LoggerFactory.get_logger()
+
+
+def list_directory(directory, extension=".abc"):
+    """
+    Lists a single directory with os.scandir and returns its mtime, matching files and sub folders.
+    Returns None if the directory can't be read.
+    """
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        files = []
+        folders = []
+        with os.scandir(directory) as it:
+            for dir_entry in it:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    folders.append(dir_entry.name)
+                elif dir_entry.name.lower().endswith(extension):
+                    files.append(dir_entry.name)
+    except OSError as e:
+        logger.warning('list_directory - Could not list %s: %s', directory, e)
+        return None
+
+    return {"mtime": mtime, "files": files, "folders": folders}
+
+
+class ParallelWalker:
+    """
+    Walks a directory tree with os.scandir across a bounded thread pool.
+
+    On network storage a walk is bound by the latency of each directory listing, not by CPU,
+    so listing several folders at once hides most of that latency. The walk can be pruned by
+    depth (max_depth of 0 means unlimited) or by folder name.
+    """
+
+    def __init__(self, workers=8, max_depth=0, exclude=()):
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.exclude = {name.lower() for name in exclude}
+
+    def walk(self, root, list_func=None):
+        """
+        Yields (directory, entry) for every folder under root as soon as it has been listed.
+        list_func(directory) must return an entry dict like list_directory, or None to skip the folder.
+        """
+        list_func = list_func or list_directory
+        root = os.path.normpath(str(root))
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            pending = {executor.submit(list_func, root): (root, 0)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory, depth = pending.pop(future)
+                    entry = future.result()
+                    if entry is None:
+                        continue
+
+                    if not self.max_depth or depth < self.max_depth:
+                        for name in entry["folders"]:
+                            if name.lower() in self.exclude:
+                                continue
+                            child = os.path.join(directory, name)
+                            pending[executor.submit(list_func, child)] = (child, depth + 1)
+
+                    yield directory, entry
+        finally:
+            # a cancelled scan closes the generator early, so drop any folders still queued
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_files(self, root, extension=".abc"):
+        """
+        Yields every matching file under root as a Path. A drop in replacement for Path.rglob.
+        """
+        for directory, entry in self.walk(root, lambda d: list_directory(d, extension)):
+            for name in entry["files"]:
+                yield Path(directory, name)
+
+
+class ScanIndex:
+    """
+    A persistent on-disk index of a publish directory tree.
+
+    Each directory is stored with its mtime, the matching files it holds and its sub folders.
+    A rescan still stats every directory, but only re-lists the ones whose mtime has changed
+    since the last scan, so an unchanged publish tree costs one stat per folder instead of a
+    full listing.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, root, index_dir, extension=".abc", walker=None):
+        self.root = os.path.normpath(str(root))
+        self.extension = extension.lower()
+        self.index_path = Path(index_dir) / f"scan_{self.root_key(self.root)}.json"
+        self.walker = walker or ParallelWalker(workers=1)
+        self.directories = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def root_key(root):
+        """
+        Returns a short, filesystem safe key for a publish root.
+        """
+        return hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+
+    def load(self):
+        """
+        Reads the index from disk. A missing, unreadable or outdated index just starts empty.
+        """
+        self.directories = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                data = json.load(index_file)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") == self.INDEX_VERSION and data.get("root") == self.root:
+            self.directories = data.get("directories", {})
+
+    def save(self):
+        """
+        Writes the index to disk, replacing the previous file in one step so a crash mid
+        write never leaves a truncated index behind.
+        """
+        data = {
+            "version": self.INDEX_VERSION,
+            "root": self.root,
+            "directories": self.directories,
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as index_file:
+                json.dump(data, index_file)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.warning('ScanIndex - Could not write index %s: %s', self.index_path, e)
+
+    def list_directory(self, directory, full_rescan=False):
+        """
+        Returns the entry for a directory, from the index when its mtime is unchanged.
+        Safe to call from the walker's worker threads.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = self.directories.get(directory)
+        if not full_rescan and entry and entry["mtime"] == mtime:
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        with self._lock:
+            self.misses += 1
+        return list_directory(directory, self.extension)
+
+    def iter_scan(self, full_rescan=False):
+        """
+        Walks the publish root and yields every matching file as a Path as soon as its
+        folder has been listed. The index is only written once the walk has completed,
+        so stopping early leaves the previous index untouched.
+
+        With full_rescan the stored index is ignored and every directory is listed again.
+        """
+        self.hits = 0
+        self.misses = 0
+        if full_rescan:
+            self.directories = {}
+        else:
+            self.load()
+
+        scanned = {}
+        found = 0
+        for directory, entry in self.walker.walk(self.root, lambda d: self.list_directory(d, full_rescan)):
+            scanned[directory] = entry
+            for name in entry["files"]:
+                found += 1
+                yield Path(directory, name)
+
+        # directories that have gone away are dropped, as only visited folders are kept
+        self.directories = scanned
+        self.save()
+
+        logger.info('ScanIndex - %s: %d files, %d directory hits, %d misses', self.root, found, self.hits, self.misses)
+
+    def scan(self, full_rescan=False):
+        """
+        Walks the publish root and returns every matching file as a Path.
+        """
+        return list(self.iter_scan(full_rescan))
@@ -0,0 +1,71 @@
+from . import naming
+
+
+SORT_KEYS = {
+    "NAME": lambda publish_name, filename: (filename.lower(),),
+    "VERSION": lambda publish_name, filename: (publish_name.version if publish_name else -1, filename.lower()),
+    "ASSET": lambda publish_name, filename: ((publish_name.asset or publish_name.base_name).lower() if publish_name else "", publish_name.version if publish_name else -1, filename.lower()),
+}
+
+
+class SearchIndex:
+    """
+    A lowercase search string per cache list entry, made of its filename and the asset, task,
+    version and type parsed from it, built once per list. Filtering is a substring test per
+    entry and the sort orders are only computed the first time they are asked for.
+    """
+
+    def __init__(self, filenames):
+        self.filenames = list(filenames)
+        self.publish_names = [naming.parse_filename(filename) for filename in self.filenames]
+        self.keys = [self.search_key(filename, publish_name) for filename, publish_name in zip(self.filenames, self.publish_names)]
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.filenames)
+
+    @staticmethod
+    def search_key(filename, publish_name):
+        if publish_name is None:
+            return filename.lower()
+        fields = [filename, publish_name.asset, publish_name.task, f"v{publish_name.version:03d}", publish_name.type]
+        return " ".join(str(field) for field in fields if field is not None).lower()
+
+    def matches(self, text):
+        """
+        Returns the indices of the entries containing every word of text, in list order.
+        """
+        terms = text.lower().split()
+        if not terms:
+            return list(range(len(self.keys)))
+        return [i for i, key in enumerate(self.keys) if all(term in key for term in terms)]
+
+    def order(self, sort_by):
+        """
+        Returns the entry indices sorted by NAME, VERSION or ASSET.
+        """
+        if sort_by not in self._orders:
+            sort_key = SORT_KEYS[sort_by]
+            self._orders[sort_by] = sorted(range(len(self.filenames)), key=lambda i: sort_key(self.publish_names[i], self.filenames[i]))
+        return self._orders[sort_by]
+
+    def page(self, text, sort_by, reverse, page, page_size):
+        """
+        Returns (indices on the page in ascending sort order, number of matches, page shown, page count).
+        A page past the end shows the last one.
+
+        With reverse the pages are cut from the descending order, page 0 holding the last
+        entries, but each page is still returned ascending: Blender reverses the order
+        filter_items returns itself when the list's reverse toggle is on.
+        """
+        matching = set(self.matches(text))
+        ordered = [i for i in self.order(sort_by) if i in matching]
+        if reverse:
+            ordered.reverse()
+
+        page_count = max(1, -(-len(ordered) // page_size))
+        page = min(max(page, 0), page_count - 1)
+        shown = ordered[page * page_size:(page + 1) * page_size]
+        if reverse:
+            shown.reverse()
+        return shown, len(ordered), page, page_count
@@ -0,0 +1,67 @@
+import os
+
+from pathlib import Path
+
+
+class ShotContext:
+    """
+    The OpenPype/Ayon shot context the add-on works in, read from the environment once and
+    kept until it is invalidated (a workfile is opened) or overridden (tests, batch runs).
+    Fields are always strings, empty when their variable isn't set.
+    """
+    __slots__ = ("work_dir", "project", "project_root", "task", "asset", "anim_dir")
+
+    _current = None
+
+    def __init__(self, work_dir="", project="", project_root="", task="", asset="", anim_dir=None):
+        self.work_dir = work_dir
+        self.project = project
+        self.project_root = project_root
+        self.task = task
+        self.asset = asset
+        if anim_dir is None:
+            anim_dir = str(Path(work_dir).parent.parent / 'publish' / 'animation') if work_dir else ""
+        self.anim_dir = anim_dir
+
+    @classmethod
+    def from_environment(cls, environ=None):
+        environ = os.environ if environ is None else environ
+        return cls(
+            work_dir=environ.get("AVALON_WORKDIR", ""),
+            project=environ.get("AVALON_PROJECT", ""),
+            project_root=environ.get("OPENPYPE_PROJECT_ROOT_WORK", ""),
+            task=environ.get("AVALON_TASK", ""),
+            asset=environ.get("AVALON_ASSET", ""),
+        )
+
+    @classmethod
+    def get(cls):
+        """
+        Returns the current context, reading the environment the first time.
+        """
+        if cls._current is None:
+            cls._current = cls.from_environment()
+        return cls._current
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drops the current context so the next get() reads the environment again.
+        """
+        cls._current = None
+
+    @classmethod
+    def override(cls, context):
+        """
+        Makes context the current one until the next invalidate().
+        """
+        cls._current = context
+
+    @property
+    def project_path(self):
+        if self.project_root and self.project:
+            return str(Path(self.project_root) / self.project)
+        return ""
+
+    def __repr__(self):
+        return f"ShotContext(project={self.project!r}, asset={self.asset!r}, task={self.task!r})"
@@ -0,0 +1,174 @@
+from bisect import bisect_right, insort
+
+from . import naming
+from .log import LoggerFactory
+
+logger = LoggerFactory.get_logger()
+
+
+class VersionIndex:
+    """
+    Maps every publish base name to its versions, kept sorted, so "what is the newest version"
+    and "which versions are newer than mine" are a dict lookup and a bisect instead of a scan
+    over every file. Built once when a scan finishes.
+
+    Entries are (version, path) tuples, with path as it was given (str or Path).
+    """
+
+    def __init__(self, paths=()):
+        self._entries = {}
+        for path in paths:
+            publish_name = naming.parse_path(path)
+            if publish_name:
+                self._entries.setdefault(publish_name.base_name, []).append((publish_name.version, path))
+
+        for entries in self._entries.values():
+            entries.sort(key=lambda entry: entry[0])
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, base_name):
+        return base_name in self._entries
+
+    def base_names(self):
+        return self._entries.keys()
+
+    def add(self, path):
+        """
+        Adds a single file, keeping its base name's versions sorted. Returns False if the name has no version.
+        """
+        publish_name = naming.parse_path(path)
+        if publish_name is None:
+            return False
+        insort(self._entries.setdefault(publish_name.base_name, []), (publish_name.version, path), key=lambda entry: entry[0])
+        return True
+
+    def remove(self, path):
+        """
+        Removes a single file. Returns False if it wasn't in the index.
+        """
+        publish_name = naming.parse_path(path)
+        entries = self._entries.get(publish_name.base_name) if publish_name else None
+        if not entries:
+            return False
+
+        path = str(path)
+        for i, (_, entry_path) in enumerate(entries):
+            if str(entry_path) == path:
+                del entries[i]
+                if not entries:
+                    del self._entries[publish_name.base_name]
+                return True
+        return False
+
+    def all_versions(self, base_name):
+        """
+        Returns every (version, path) of a base name, oldest first.
+        """
+        return list(self._entries.get(base_name, ()))
+
+    def latest(self, base_name):
+        """
+        Returns the (version, path) of the newest version of a base name, or None.
+        """
+        entries = self._entries.get(base_name)
+        return entries[-1] if entries else None
+
+    def latest_for(self, path):
+        """
+        Returns the newest (version, path) sharing a base name with the given file or filename, or None.
+        """
+        publish_name = naming.parse_path(path)
+        return self.latest(publish_name.base_name) if publish_name else None
+
+    def newer_than(self, path):
+        """
+        Returns every (version, path) newer than the given file or filename, oldest first.
+        """
+        publish_name = naming.parse_path(path)
+        if publish_name is None:
+            return []
+        entries = self._entries.get(publish_name.base_name, ())
+        return list(entries[bisect_right(entries, publish_name.version, key=lambda entry: entry[0]):])
+
+    def latest_paths(self):
+        """
+        Returns the path of the newest version of every base name, in the order base names were first seen.
+        """
+        return [entries[-1][1] for entries in self._entries.values()]
+
+
+def find_updates(version_index, named_paths):
+    """
+    Takes (name, path) pairs, e.g. cache file datablocks and their file paths, and returns
+    (name, current_version, latest_version, latest_path) for each one with a newer version in the index.
+    """
+    updates = []
+    for name, path in named_paths:
+        current = naming.parse_path(path)
+        if current is None:
+            continue
+        latest = version_index.latest(current.base_name)
+        if latest is not None and latest[0] > current.version:
+            updates.append((name, current.version, latest[0], latest[1]))
+    return updates
+
+
+# some testing methods for version change notification. Polling from the UI event loop never worked,
+# new publishes are picked up by properties.LiveRefresh, which watches the folder off the main thread
+class VersionChecker:
+    """
+    Version queries against a list of publish files. Pass a VersionIndex to reuse one
+    that has already been built, e.g. ScanResults.version_index.
+    """
+
+    def __init__(self, version_index=None):
+        self.version_index = version_index
+
+    def get_index(self, file_list):
+        if file_list is None and self.version_index is not None:
+            return self.version_index
+        return VersionIndex(file_list or [])
+
+    def get_latest_versions(self,files=None):
+        return self.get_index(files).latest_paths()
+ 
+    def extract_version(self, filename):
+        return naming.extract_version(filename)
+        
+    def get_matched_files(self, filename, file_list=None):
+
+        current = naming.parse_path(filename)
+        if current is None:
+            error_msg = "Filename format is incorrect"
+            logger.error(error_msg)
+            return error_msg
+
+        logger.debug('current cache version: %s', current.version)
+        logger.debug('Base filename: %s', current.base_name)
+
+        return [path for _, path in self.get_index(file_list).newer_than(filename)]
+    
+    def compare_versions(self, filename, file_list=None):
+
+        if not filename:
+            return "Filename not present"
+        
+        current = naming.parse_path(filename)
+        if current is None:
+            error_msg = "No version found in filename"
+            logger.error(error_msg)
+            return error_msg
+
+        logger.debug('Current version extracted from filename: %s', current.version)
+
+        latest = self.get_index(file_list).latest(current.base_name)
+        if latest and latest[0] > current.version:
+            logger.debug('Extracted higher version %s from file %s', latest[0], latest[1])
+            return latest[0]
+
+        return current.version
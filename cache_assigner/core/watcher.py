@@ -0,0 +1,272 @@
+import os
+import sys
+import errno
+import queue
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+
+from .log import LoggerFactory
+from .scanner import ScanIndex, list_directory
+
+logger = LoggerFactory.get_logger()
+
+ADDED = "added"
+REMOVED = "removed"
+# the watcher lost track of events and the whole tree should be checked again
+RESCAN = "rescan"
+
+# filesystems where inotify only sees changes made from this machine
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "fuse.sshfs", "9p", "lustre", "gpfs", "beegfs"}
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_network_path(path):
+    """
+    Returns True if path sits on a network mount, according to /proc/mounts.
+    Anywhere /proc/mounts doesn't exist the answer is False.
+    """
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as mounts:
+            entries = [line.split()[1:3] for line in mounts if len(line.split()) > 2]
+    except OSError:
+        return False
+
+    path = os.path.realpath(path)
+    best_mount, best_type = "", ""
+    for mount_point, fs_type in entries:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fs_type
+    return best_type in NETWORK_FILESYSTEMS
+
+
+def inotify_available():
+    return sys.platform.startswith("linux") and ctypes.util.find_library("c") is not None
+
+
+class InotifyWatcher:
+    """
+    Watches a publish tree with Linux inotify and reports added and removed cache files.
+    New folders are watched as they appear, and anything already inside them is reported.
+
+    The watches are added on the watcher thread, as that means listing every folder of the
+    tree again. Files that changed against known_files while they were being added are
+    reported, and if the kernel's watch limit is hit the fallback watcher takes over.
+    """
+
+    def __init__(self, root, events, known_files=(), fallback=None, extension=".abc"):
+        self.root = os.path.normpath(str(root))
+        self.events = events
+        self.known_files = known_files
+        self.fallback = fallback
+        self.extension = extension
+        self.watches = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch_tree(self, directory, report=True, found=None):
+        """
+        Adds a watch to every folder under directory. Raises OSError when the watch limit is hit.
+        The files seen are reported as added, or collected into found.
+        """
+        pending = [directory]
+        while pending:
+            folder = pending.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    # gone, or not a folder any more, before we got to it
+                    continue
+                raise OSError(error, f"inotify_add_watch failed for {folder}")
+            self.watches[wd] = folder
+
+            entry = list_directory(folder, self.extension)
+            if entry is None:
+                continue
+            if report:
+                for name in entry["files"]:
+                    self.events.put((ADDED, os.path.join(folder, name)))
+            elif found is not None:
+                found.update(os.path.join(folder, name) for name in entry["files"])
+            pending.extend(os.path.join(folder, name) for name in entry["folders"])
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.fallback is not None:
+            self.fallback.stop()
+
+    def setup(self):
+        """
+        Watches the tree and reports what changed since known_files. Returns False if the
+        tree can't be watched.
+        """
+        found = set()
+        try:
+            self.watch_tree(self.root, report=False, found=found)
+        except OSError as e:
+            logger.warning('InotifyWatcher - Could not watch %s (%s), polling instead', self.root, e)
+            return False
+
+        known = {str(path) for path in self.known_files}
+        self.known_files = ()
+        for path in found - known:
+            self.events.put((ADDED, path))
+        for path in known - found:
+            self.events.put((REMOVED, path))
+        logger.info('Watching %s with inotify (%d folders)', self.root, len(self.watches))
+        return True
+
+    def run(self):
+        try:
+            if not self.setup():
+                os.close(self._fd)
+                self._fd = None
+                if self.fallback is not None:
+                    self.fallback.run()
+                return
+
+            while not self._stop.is_set():
+                readable, _, _ = select.select([self._fd], [], [], 0.5)
+                if readable:
+                    self.read_events()
+        except Exception as e:
+            logger.error('InotifyWatcher - Stopped watching %s: %s', self.root, e)
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+
+    def read_events(self):
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        pos = 0
+        while pos < len(buf):
+            wd, mask, _, name_length = EVENT_HEADER.unpack_from(buf, pos)
+            pos += EVENT_HEADER.size
+            name = os.fsdecode(buf[pos:pos + name_length].rstrip(b"\0"))
+            pos += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                self.events.put((RESCAN, self.root))
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            folder = self.watches.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self.watch_tree(path)
+                    except OSError as e:
+                        logger.warning('InotifyWatcher - %s, falling back to a rescan', e)
+                        self.events.put((RESCAN, self.root))
+                elif mask & IN_MOVED_FROM:
+                    # the files inside went with it and won't get their own events
+                    self.events.put((RESCAN, self.root))
+            elif path.lower().endswith(self.extension):
+                # a file is only reported once it has been fully written or moved into place
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    self.events.put((ADDED, path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.events.put((REMOVED, path))
+
+
+class PollingWatcher:
+    """
+    Polls a publish tree at a low frequency for network mounts, where inotify doesn't see
+    changes made by other machines. Each poll is an incremental ScanIndex scan, so unchanged
+    folders cost one stat each.
+    """
+
+    def __init__(self, root, events, index_dir, known_files=(), interval=60.0, walker=None):
+        self.root = os.path.normpath(str(root))
+        self.events = events
+        self.interval = interval
+        self.scan_index = ScanIndex(self.root, index_dir, walker=walker)
+        # turned into a set on the watcher thread
+        self.known_files = known_files
+        self.known = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def poll(self):
+        current = {str(path) for path in self.scan_index.scan()}
+        for path in current - self.known:
+            self.events.put((ADDED, path))
+        for path in self.known - current:
+            self.events.put((REMOVED, path))
+        self.known = current
+
+    def run(self):
+        self.known = {str(path) for path in self.known_files}
+        self.known_files = ()
+        logger.info('Polling %s every %gs', self.root, self.interval)
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error('PollingWatcher - Poll of %s failed: %s', self.root, e)
+
+
+def create_watcher(root, index_dir, mode="AUTO", known_files=(), interval=60.0, walker=None):
+    """
+    Returns a started watcher for root and the queue its (event, path) deltas arrive on.
+
+    mode is AUTO, INOTIFY or POLL. AUTO uses inotify on local Linux folders and polling on
+    network mounts and everywhere else. INOTIFY falls back to polling when the kernel's
+    watch limit is reached.
+    """
+    events = queue.Queue()
+    known_files = tuple(known_files)
+    polling = PollingWatcher(root, events, index_dir, known_files, interval, walker)
+    watcher = polling
+
+    use_inotify = mode == "INOTIFY" or (mode == "AUTO" and not is_network_path(root))
+    if use_inotify and inotify_available():
+        try:
+            watcher = InotifyWatcher(root, events, known_files, fallback=polling)
+        except OSError as e:
+            logger.warning('Could not watch %s with inotify (%s), polling instead', root, e)
+
+    watcher.start()
+    return watcher, events
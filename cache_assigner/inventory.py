@@ -0,0 +1,141 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from .core import naming
+from .core.log import LoggerFactory
+from .properties import ScanResults, CachePrefetch
+from .core.versions import find_updates
+
+logger = LoggerFactory.get_logger()
+
+
+class CacheInventory:
+    """
+    Every CacheFile datablock in the open file with its parsed publish name, keyed by datablock
+    pointer. Built when a file is loaded and kept up to date from depsgraph updates, so the
+    panel and the outdated checks look a cache file up instead of walking bpy.data.
+    """
+    entries = None
+    # bumped on every change, so anything derived from the inventory knows to recompute
+    generation = 0
+
+    _outdated_key = None
+    _outdated = []
+
+    @classmethod
+    def rebuild(cls):
+        cls.entries = {}
+        for cache_file in bpy.data.cache_files:
+            cls.store(cache_file)
+        cls.generation += 1
+        logger.debug('CacheInventory - %d cache files', len(cls.entries))
+
+    @classmethod
+    def store(cls, cache_file):
+        filepath = cache_file.filepath
+        cls.entries[cache_file.as_pointer()] = (cache_file.name, filepath, naming.parse_path(filepath) if filepath else None, bool(cache_file.library))
+
+    @classmethod
+    def ensure(cls):
+        if cls.entries is None:
+            cls.rebuild()
+
+    @classmethod
+    def update(cls, depsgraph):
+        """
+        Applies a depsgraph update. Returns True if the inventory changed.
+        """
+        if cls.entries is None:
+            return False
+        if len(bpy.data.cache_files) != len(cls.entries):
+            # added or removed, which the depsgraph doesn't report for every datablock type
+            cls.rebuild()
+            return True
+
+        changed = False
+        for update in depsgraph.updates:
+            cache_file = update.id.original if isinstance(update.id, bpy.types.CacheFile) else None
+            if cache_file is None:
+                continue
+            entry = cls.entries.get(cache_file.as_pointer())
+            if entry is None or entry[0] != cache_file.name or entry[1] != cache_file.filepath:
+                cls.store(cache_file)
+                changed = True
+        if changed:
+            cls.generation += 1
+        return changed
+
+    @classmethod
+    def refresh(cls, *cache_files):
+        """
+        Updates cache files straight away, for code that has just changed them.
+        """
+        cls.ensure()
+        for cache_file in cache_files:
+            cls.store(cache_file)
+        cls.generation += 1
+        cls.prefetch_outdated()
+
+    @classmethod
+    def get(cls, cache_file):
+        """
+        Returns (name, filepath, PublishName or None, is_linked) for a CacheFile, or None.
+        """
+        cls.ensure()
+        return cls.entries.get(cache_file.as_pointer())
+
+    @classmethod
+    def outdated(cls):
+        """
+        Returns (pointer, name, current_version, latest_version, latest_path) for every local
+        cache file with a newer version in the last scan, pointer being the datablock's
+        as_pointer(). Recomputed only when the inventory or the scan changes.
+        """
+        cls.ensure()
+        key = (cls.generation, ScanResults.generation, id(ScanResults.version_index))
+        if key != cls._outdated_key:
+            cls._outdated_key = key
+            local_caches = [(pointer, entry[1]) for pointer, entry in cls.entries.items() if not entry[3]]
+            cls._outdated = [
+                (pointer, cls.entries[pointer][0], current_version, latest_version, latest_path)
+                for pointer, current_version, latest_version, latest_path in find_updates(ScanResults.version_index, local_caches)
+            ]
+        return cls._outdated
+
+    @classmethod
+    def prefetch_outdated(cls):
+        """
+        Hands the newer versions of the loaded caches to CachePrefetch. Called where the
+        inventory or the scan changes, not from outdated(), which the UI calls while drawing.
+        """
+        if CachePrefetch.is_enabled():
+            CachePrefetch.request([latest_path for _, _, _, _, latest_path in cls.outdated()])
+
+    @classmethod
+    def clear(cls):
+        cls.entries = None
+        cls._outdated_key = None
+        cls._outdated = []
+
+
+@persistent
+def inventory_depsgraph_update_post(scene, depsgraph):
+    if CacheInventory.update(depsgraph):
+        CacheInventory.prefetch_outdated()
+
+@persistent
+def inventory_load_post(*args):
+    CacheInventory.rebuild()
+    CacheInventory.prefetch_outdated()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(inventory_depsgraph_update_post)
+    bpy.app.handlers.load_post.append(inventory_load_post)
+
+def unregister():
+    if inventory_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(inventory_depsgraph_update_post)
+    if inventory_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(inventory_load_post)
+    CacheInventory.clear()
@@ -6,7 +6,10 @@ import math
 import re
 
 from . import utils
+from .core import matching
 from . import preferences
+from .inventory import CacheInventory
+from .core.profiling import Profiler
 
 from .utils import LoggerFactory
 logger = LoggerFactory.get_logger()
@@ -20,6 +23,57 @@ class LoadAlembicCacheFromFile(bpy.types.Operator):
     # def poll(cls, context):
     #     return context.active_object is not None and context.scene.CacheAssignerProperties.abc_files and len(context.scene.CacheAssignerProperties.abc_files) > 0
 
+    def validate_cache(self, abc_file_path, mesh_objs):
+        """
+        Reads the object hierarchy of the new file from its headers and checks the collection
+        will find something in it, before the datablock is retargeted and reloaded.
+        """
+        from .core import archive
+
+        try:
+            object_paths = archive.inspect(abc_file_path)["object_paths"]
+        except (OSError, archive.AlembicReadError) as e:
+            # let Blender have a go at anything the header reader doesn't understand
+            logger.debug('Could not pre-validate %s: %s', abc_file_path, e)
+            return True
+
+        object_names = [obj.name for obj in mesh_objs if 'MeshSequenceCache' in obj.modifiers]
+        matched, ambiguous, unmatched = matching.match_objects(object_names, object_paths)
+        logger.debug('Pre-validation of %s: %d matched, %d ambiguous, %d unmatched', abc_file_path, len(matched), len(ambiguous), len(unmatched))
+
+        if object_names and not matched:
+            self.report({'ERROR'}, "None of the objects in this collection were found in the selected cache. Nothing was changed.")
+            return False
+        return True
+
+    def remap_object_paths(self, abcFile, mesh_objs):
+        """
+        Points every MeshSequenceCache modifier in the collection at the cache file and matches
+        each object to its path in the Alembic hierarchy through a prebuilt name index.
+        """
+        path_index = matching.ObjectPathIndex([object_path.path for object_path in abcFile.object_paths])
+
+        ambiguous = []
+        unmatched = []
+        for obj in mesh_objs:
+            modifier = obj.modifiers.get('MeshSequenceCache')
+            if modifier is None:
+                continue
+
+            modifier.cache_file = abcFile
+            path, candidates = path_index.match(obj.name)
+            if path:
+                modifier.object_path = path
+            elif candidates:
+                ambiguous.append(obj.name)
+                logger.warning('Ambiguous match for %s: %s', obj.name, candidates)
+            else:
+                unmatched.append(obj.name)
+                logger.warning('No object path found for %s', obj.name)
+
+        if ambiguous or unmatched:
+            self.report({'WARNING'}, f"{len(ambiguous)} objects matched more than one cache path and {len(unmatched)} matched none. Check the system console for details.")
+
     def execute(self, context):   
         selObj = bpy.context.object
         cacheProps = context.scene.CacheAssignerProperties 
@@ -38,7 +92,7 @@ class LoadAlembicCacheFromFile(bpy.types.Operator):
             else:
                 self.report({'ERROR'}, "I couldn't a Mesh sequence cache modifier. Please add one and load a base file to continue...")
 
-            logger.debug (f'abc DataBlock {abcDataBlock}')
+            logger.debug('abc DataBlock %s', abcDataBlock)
             
             if abcDataBlock: 
 
@@ -46,61 +100,214 @@ class LoadAlembicCacheFromFile(bpy.types.Operator):
                 if abc_file_index >= 0 and abc_file_index < len(cacheProps.abc_files):
                     abc_file_path = cacheProps.abc_files[abc_file_index].path
                 else:
-                    return
+                    self.report({'ERROR'}, "Select a cache file in the list to load.")
+                    return {'CANCELLED'}
+                with Profiler.stage("load.validate", len(mesh_objs)):
+                    valid = self.validate_cache(abc_file_path, mesh_objs)
+                if not valid:
+                    return {'CANCELLED'}
+
                 # get the alembic file from the datablock name   
                 abcFile = bpy.data.cache_files[abcDataBlock]
-                # set the abc filepath                
-                abcFile.filepath = abc_file_path
-
-                # make sure you reload the datablock, otherwise the object paths will not resolve
-                bpy.ops.cachefile.reload() 
-
-                for obj in mesh_objs:  
-                    if 'MeshSequenceCache' in obj.modifiers:                                  
-                            obj.modifiers['MeshSequenceCache'].cache_file = abcFile
-                            abcPath = abcFile.object_paths   
-
-                            for cacheObjPath in abcPath.items():                                                                                     
-                                # print (f'CACHE PATH - {cacheObjPath}')
-                                path= cacheObjPath[0]
-                                # need to split the object from any instancing
-                                base_object_name = obj.name.split('.')[0]
-                                if base_object_name in path:
-                                    obj.modifiers['MeshSequenceCache'].cache_file = abcFile                                   
-                                    obj.modifiers['MeshSequenceCache'].object_path = path     
-                                    # logger.debug (f'MATCH - OBJ {obj.name} {base_object_name}\n\tABC PATH {path}')                        
-                                else:
-                                    pass
-                                    # logger.debug (f'NO MATCH - BASE {base_object_name} OBJ {obj.name}\n\t PATH - {path}')
+                # reuse a datablock already reading this file with the same settings, so the archive is only opened once
+                existing = utils.cache_files_by_key().get(utils.cache_file_key(abcFile, abc_file_path))
+
+                if existing is not None and existing != abcFile:
+                    logger.debug('Reusing cache file %s for %s', existing.name, abc_file_path)
+                    abcFile = existing
+                else:
+                    # set the abc filepath                
+                    abcFile.filepath = abc_file_path
+
+                    # make sure you reload the datablock, otherwise the object paths will not resolve
+                    with Profiler.stage("load.reload", 1):
+                        utils.reload_cache_file(context, abcFile)
+
+                with Profiler.stage("load.remap", len(mesh_objs)):
+                    self.remap_object_paths(abcFile, mesh_objs)
 
         return {'FINISHED'}
 
+
+class UpdateOutdatedCaches(bpy.types.Operator):
+    """Point every outdated cache file in the scene at its latest published version"""
+    bl_idname = "object.update_outdated_caches"
+    bl_label = "Update All Outdated Caches"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        # the latest versions come from the last scan, the inventory only recomputes when either changes
+        return bool(CacheInventory.outdated())
+
+    def execute(self, context):
+        updated = []
+        changed = []
+
+        # the inventory is keyed by pointer, names can repeat across libraries or change after it was built
+        cache_files = {cache_file.as_pointer(): cache_file for cache_file in bpy.data.cache_files}
+
+        # linked datablocks are left out by the inventory, they can't be edited from this file
+        for pointer, name, current_version, latest_version, latest_path in list(CacheInventory.outdated()):
+            cache_file = cache_files.get(pointer)
+            if cache_file is None:
+                continue
+            cache_file.filepath = str(latest_path)
+            # one reload per datablock, every modifier using it picks up the new file
+            with Profiler.stage("update_outdated.reload", 1):
+                utils.reload_cache_file(context, cache_file)
+            changed.append(cache_file)
+            updated.append((cache_file.name, current_version, latest_version))
+
+        if changed:
+            # once for the lot, each refresh recomputes the outdated list
+            CacheInventory.refresh(*changed)
+
+        for name, old_version, new_version in updated:
+            logger.info('UpdateOutdatedCaches - %s: v%03d -> v%03d', name, old_version, new_version)
+
+        summary = f"Updated {len(updated)} of {len(bpy.data.cache_files)} cache files to their latest version."
+        logger.info(summary)
+        self.report({'INFO'}, summary)
+        return {'FINISHED'}
+
     
+class DeduplicateCacheFiles(bpy.types.Operator):
+    """Merge cache files that read the same Alembic file with the same settings"""
+    bl_idname = "object.deduplicate_cache_files"
+    bl_label = "Deduplicate Cache Files"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return len(bpy.data.cache_files) > 1
+
+    def execute(self, context):
+        used = utils.cache_file_users()
+
+        groups = {}
+        for cache_file in bpy.data.cache_files:
+            if not cache_file.library:
+                groups.setdefault(utils.cache_file_key(cache_file), []).append(cache_file)
+
+        duplicates = []
+        rewired = 0
+        for cache_files in groups.values():
+            if len(cache_files) < 2:
+                continue
+            # the datablock with the most users survives, so the fewest owners need rewiring
+            survivor = max(cache_files, key=lambda cache_file: (len(used.get(cache_file, ())), cache_file.use_fake_user))
+            for cache_file in cache_files:
+                if cache_file == survivor:
+                    continue
+                for obj, owner in used.get(cache_file, ()):
+                    owner.cache_file = survivor
+                    rewired += 1
+                logger.debug('DeduplicateCacheFiles - %s merged into %s', cache_file.name, survivor.name)
+                duplicates.append(cache_file)
+
+        if duplicates:
+            bpy.data.batch_remove(duplicates)
+
+        summary = f"Merged {len(duplicates)} duplicate cache files, {rewired} modifiers and constraints rewired."
+        logger.info(summary)
+        self.report({'INFO'}, summary)
+        return {'FINISHED'}
+
+
 class OBJECT_OT_purge_unused_caches(bpy.types.Operator):
-    """Purge Unused Materials"""
+    """Remove cache files that no modifier or constraint uses"""
     bl_idname = "object.purge_unused_caches"
     bl_label = "Purge Unused Caches"
     bl_options = {'REGISTER', 'UNDO'}
 
-    # @classmethod
-    # def poll(cls, context):
-    #     return True
-        # context.area.type == 'VIEW_3D'
+    @classmethod
+    def poll(cls, context):
+        return len(bpy.data.cache_files) > 0
+
+    def execute(self, context):
+        used = utils.cache_file_users()
+
+        # linked datablocks belong to their library, and a fake user means keep it
+        unused = [
+            cache_file for cache_file in bpy.data.cache_files
+            if cache_file not in used and not cache_file.library and not cache_file.use_fake_user
+        ]
+        if not unused:
+            self.report({'INFO'}, "No unused cache files found.")
+            return {'FINISHED'}
+
+        # sizes of the archives whose handles are released, as Blender doesn't report datablock memory
+        released = 0
+        for cache_file in unused:
+            logger.debug('OBJECT_OT_purge_unused_caches - Removing %s (%s)', cache_file.name, cache_file.filepath)
+            try:
+                released += os.path.getsize(bpy.path.abspath(cache_file.filepath))
+            except OSError:
+                pass
+
+        count = len(unused)
+        bpy.data.batch_remove(unused)
+
+        summary = f"Removed {count} unused cache files, releasing {released / (1024 * 1024):.1f} MB of archives."
+        logger.info(summary)
+        self.report({'INFO'}, summary)
+        return {'FINISHED'}
+
+
+class ExportPerformanceReport(bpy.types.Operator):
+    """Save the recorded timings to a file"""
+    bl_idname = "object.export_cache_assigner_performance"
+    bl_label = "Export Performance Report"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+
+    format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Stage totals and every recorded event"),
+            ('CHROME', "Chrome Trace", "Trace Event file for chrome://tracing or Perfetto"),
+        ],
+        default='JSON'
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "cache_assigner_trace.json" if self.format == 'CHROME' else "cache_assigner_performance.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
     def execute(self, context):
-        # Iterate over all materials and remove those with no users
-        # materials_to_remove = [mat for mat in bpy.data.materials if mat.users == 0]
+        path = bpy.path.abspath(self.filepath)
+        try:
+            if self.format == 'CHROME':
+                Profiler.export_chrome_trace(path)
+            else:
+                Profiler.export_json(path)
+        except OSError as e:
+            self.report({'ERROR'}, f"Couldn't write {path}: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Performance report saved to {path}")
+        return {'FINISHED'}
 
-        # for mat in materials_to_remove:
-        #     bpy.data.materials.remove(mat)
-        
-        # self.report({'INFO'}, f"Removed {len(materials_to_remove)} unused materials.")
+
+class ClearPerformanceReport(bpy.types.Operator):
+    """Forget the recorded timings"""
+    bl_idname = "object.clear_cache_assigner_performance"
+    bl_label = "Clear Performance Report"
+
+    def execute(self, context):
+        Profiler.clear()
         return {'FINISHED'}
 
 
 class_list = [
     OBJECT_OT_purge_unused_caches,
     LoadAlembicCacheFromFile,
+    UpdateOutdatedCaches,
+    DeduplicateCacheFiles,
+    ExportPerformanceReport,
+    ClearPerformanceReport,
 ]
 
 def register():    
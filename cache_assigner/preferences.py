@@ -1,12 +1,16 @@
 import bpy
 from bpy.types import Operator, AddonPreferences, PropertyGroup
-from bpy.props import StringProperty, CollectionProperty, IntProperty, BoolProperty
+from bpy.props import StringProperty, CollectionProperty, IntProperty, BoolProperty, FloatProperty, EnumProperty
 
 import os
 import json
 import logging
 
 from .utils import LoggerFactory
+from .core.scanner import ParallelWalker
+from .core import naming
+from .core.profiling import Profiler
+from .core.shot_context import ShotContext
 logger = LoggerFactory.get_logger()
 
 class AlembicFilePathItem(PropertyGroup):
@@ -21,14 +25,190 @@ class AlembicFilePathItem(PropertyGroup):
         )
 
 
+class ProjectNamingItem(PropertyGroup):
+    project: StringProperty(
+        name="Project",
+        description="Project these templates are used for, as the pipeline names it (AVALON_PROJECT)",
+        default="",
+        update=lambda self, context: get(context).update_naming()
+    )
+    naming_templates: StringProperty(
+        name="Naming Templates",
+        description="Semicolon separated templates for this project's publish filenames. Empty uses the global templates",
+        default="",
+        update=lambda self, context: get(context).update_naming()
+    )
+    nice_name_template: StringProperty(
+        name="Nice Name Template",
+        description="How the cache list shows this project's files when Nice Name is on. Empty uses the global template",
+        default="",
+        update=lambda self, context: get(context).update_naming()
+    )
+
+
+class AddProjectNaming(Operator):
+    """Add naming templates for one project"""
+    bl_idname = "preferences.cache_assigner_add_project_naming"
+    bl_label = "Add Project Naming"
+
+    def execute(self, context):
+        item = get(context).project_naming.add()
+        item.project = ShotContext.get().project or ""
+        return {'FINISHED'}
+
+
+class RemoveProjectNaming(Operator):
+    """Remove these project naming templates"""
+    bl_idname = "preferences.cache_assigner_remove_project_naming"
+    bl_label = "Remove Project Naming"
+
+    index: IntProperty()
+
+    def execute(self, context):
+        prefs = get(context)
+        if 0 <= self.index < len(prefs.project_naming):
+            prefs.project_naming.remove(self.index)
+            prefs.update_naming()
+        return {'FINISHED'}
+
+
 class CacheAssignerPreferences(AddonPreferences):
     bl_idname = "cache_assigner"
 
     task_filter: StringProperty(name="Task Filter", default="animation")
 
+    naming_templates: StringProperty(
+        name="Naming Templates",
+        description="Semicolon separated templates publish filenames are parsed with, first match wins. "
+                    "{field} is any text, {field:03d} a number, {field:a|b} one of the choices and * skips any text",
+        default="; ".join(naming.DEFAULT_TEMPLATES),
+        update=lambda self, context: self.update_naming()
+    )
+
+    nice_name_template: StringProperty(
+        name="Nice Name Template",
+        description="How the cache list shows a file when Nice Name is on, using the fields of its naming template",
+        default=naming.DEFAULT_NICE_TEMPLATE,
+        update=lambda self, context: self.update_naming()
+    )
+
+    project_naming: CollectionProperty(type=ProjectNamingItem)
+
+    use_scan_index: BoolProperty(
+        name="Use Scan Index",
+        description="Keep an on-disk index of the publish folders so a rescan only re-lists folders that have changed",
+        default=True
+    )
+
+    background_scan: BoolProperty(
+        name="Scan in Background",
+        description="Walk the publish folders on a worker thread and fill the cache list as files are found",
+        default=True
+    )
+
+    scan_workers: IntProperty(
+        name="Scan Threads",
+        description="How many publish folders are listed at the same time. Raise this on high latency network storage",
+        default=8,
+        min=1,
+        max=64
+    )
+
+    scan_max_depth: IntProperty(
+        name="Max Folder Depth",
+        description="How deep below the publish folder to look for caches. 0 means no limit",
+        default=0,
+        min=0
+    )
+
+    scan_exclude: StringProperty(
+        name="Skip Folders",
+        description="Comma separated folder names that are never scanned",
+        default=""
+    )
+
+    load_metadata: BoolProperty(
+        name="Show Cache Details",
+        description="Read the frame range, object count and size of each listed cache in the background",
+        default=True
+    )
+
+    metadata_cache_size: IntProperty(
+        name="Cached Details",
+        description="How many caches to remember details for before the least recently used are dropped",
+        default=5000,
+        min=100
+    )
+
+    prefetch_newer_versions: BoolProperty(
+        name="Prefetch Newer Versions",
+        description="When a newer version of a loaded cache is found, read it in the background so loading it doesn't wait on the network",
+        default=True
+    )
+
+    prefetch_bandwidth: FloatProperty(
+        name="Prefetch Bandwidth (MB/s)",
+        description="The most a workstation reads per second while prefetching, so many machines don't flood the file server at once. 0 means no limit",
+        default=20.0,
+        min=0.0
+    )
+
+    list_page_size: IntProperty(
+        name="Caches per Page",
+        description="How many caches the list shows at once. Use the list's filter options to page through the rest",
+        default=200,
+        min=10
+    )
+
+    watch_publish_folder: BoolProperty(
+        name="Watch Publish Folder",
+        description="After a scan, keep watching the publish folder and add or remove caches in the list as they are published",
+        default=False
+    )
+
+    watch_mode: EnumProperty(
+        name="Watch Method",
+        description="How the publish folder is watched for changes",
+        items=[
+            ('AUTO', "Automatic", "inotify on local Linux folders, polling on network mounts and other platforms"),
+            ('INOTIFY', "inotify", "Use inotify where it's available, even on network mounts"),
+            ('POLL', "Polling", "Check the publish folder for changes at a fixed interval"),
+        ],
+        default='AUTO'
+    )
+
+    watch_interval: FloatProperty(
+        name="Poll Interval",
+        description="Seconds between checks of the publish folder when it is polled",
+        default=60.0,
+        min=5.0
+    )
+
+    cache_dir: StringProperty(
+        name="Local Cache Folder",
+        description="Where the add-on keeps its local index files. Leave empty to use the Blender user data folder",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    profiling: BoolProperty(
+        name="Record Performance",
+        description="Time scanning, drawing and loading, shown in the Performance panel and exportable for support tickets",
+        default=False,
+        update=lambda self, context: self.update_profiling()
+    )
+
+    profile_buffer_size: IntProperty(
+        name="Recorded Events",
+        description="How many timed events are kept for the trace export, oldest are dropped first",
+        default=10000,
+        min=100,
+        update=lambda self, context: self.update_profiling()
+    )
+
     debug_mode: BoolProperty(
         name="Debugging Mode",
-        default=True,
+        default=False,
         update=lambda self, context: self.update_logging_level()
     )
 
@@ -39,9 +219,80 @@ class CacheAssignerPreferences(AddonPreferences):
         else:
             LoggerFactory.set_level(logging.INFO)
 
+    def update_profiling(self):
+        Profiler.enable(self.profiling, self.profile_buffer_size)
+
+    def naming_for_project(self, project):
+        """
+        Returns the (naming templates, nice name template) strings for a project: its own
+        where it has them, the global ones otherwise.
+        """
+        templates, nice_template = self.naming_templates, self.nice_name_template
+        project = (project or "").strip().lower()
+        for item in self.project_naming:
+            if project and item.project.strip().lower() == project:
+                templates = item.naming_templates.strip() or templates
+                nice_template = item.nice_name_template.strip() or nice_template
+                break
+        return templates, nice_template
+
+    def update_naming(self, reparse=True):
+        """
+        Switches to the naming templates of the open shot's project. Compiled templates are
+        cached, so switching back to a project doesn't compile them again.
+        """
+        templates, nice_template = self.naming_for_project(ShotContext.get().project)
+        templates = [template.strip() for template in templates.split(";") if template.strip()]
+        try:
+            changed = naming.configure(templates, nice_template.strip())
+        except ValueError as e:
+            logger.error('%s, using the default naming templates', e)
+            changed = naming.configure()
+
+        if reparse and changed:
+            # anything parsed with the previous templates is parsed again
+            from . import properties, inventory
+            properties.ScanResults.reparse()
+            inventory.CacheInventory.clear()
+
     def draw(self, context):
         layout = self.layout
         # layout.prop(self, "task_filter", text="Task Filter")
+        layout.prop(self, "naming_templates")
+        layout.prop(self, "nice_name_template")
+        box = layout.box()
+        row = box.row()
+        row.label(text="Project Naming")
+        row.operator("preferences.cache_assigner_add_project_naming", text="", icon='ADD')
+        for i, item in enumerate(self.project_naming):
+            col = box.column(align=True)
+            row = col.row(align=True)
+            row.prop(item, "project")
+            row.operator("preferences.cache_assigner_remove_project_naming", text="", icon='X').index = i
+            col.prop(item, "naming_templates")
+            col.prop(item, "nice_name_template")
+        layout.prop(self, "use_scan_index")
+        layout.prop(self, "background_scan")
+        layout.prop(self, "scan_workers")
+        layout.prop(self, "scan_max_depth")
+        layout.prop(self, "scan_exclude")
+        layout.prop(self, "load_metadata")
+        layout.prop(self, "metadata_cache_size")
+        layout.prop(self, "prefetch_newer_versions")
+        col = layout.column()
+        col.active = self.prefetch_newer_versions
+        col.prop(self, "prefetch_bandwidth")
+        layout.prop(self, "list_page_size")
+        layout.prop(self, "watch_publish_folder")
+        col = layout.column()
+        col.active = self.watch_publish_folder
+        col.prop(self, "watch_mode")
+        col.prop(self, "watch_interval")
+        layout.prop(self, "cache_dir")
+        layout.prop(self, "profiling")
+        col = layout.column()
+        col.active = self.profiling
+        col.prop(self, "profile_buffer_size")
         layout.prop(self, "debug_mode", text="Enable Debugging Mode (Check system console for extra messages)")
 
 def get(context: bpy.types.Context) -> CacheAssignerPreferences:
@@ -52,11 +303,31 @@ def get(context: bpy.types.Context) -> CacheAssignerPreferences:
     ), "Expected CacheAssignerPreferences, got %s instead" % (type(prefs))
     return prefs
 
+
+def get_walker(context: bpy.types.Context) -> ParallelWalker:
+    """Return a directory walker set up from the add-on preferences."""
+    prefs = get(context)
+    exclude = [name.strip() for name in prefs.scan_exclude.split(",") if name.strip()]
+    return ParallelWalker(workers=prefs.scan_workers, max_depth=prefs.scan_max_depth, exclude=exclude)
+
+def get_cache_dir(context: bpy.types.Context) -> str:
+    """Return the folder used for the add-on's local index files."""
+    prefs = get(context)
+    if prefs.cache_dir:
+        return bpy.path.abspath(prefs.cache_dir)
+    return bpy.utils.user_resource('DATAFILES', path="cache_assigner", create=True)
+
   
 def register():
     bpy.utils.register_class(AlembicFilePathItem)
+    bpy.utils.register_class(ProjectNamingItem)
+    bpy.utils.register_class(AddProjectNaming)
+    bpy.utils.register_class(RemoveProjectNaming)
     bpy.utils.register_class(CacheAssignerPreferences)
 
 def unregister():
     bpy.utils.unregister_class(CacheAssignerPreferences)
+    bpy.utils.unregister_class(RemoveProjectNaming)
+    bpy.utils.unregister_class(AddProjectNaming)
+    bpy.utils.unregister_class(ProjectNamingItem)
     bpy.utils.unregister_class(AlembicFilePathItem)
@@ -1,122 +1,661 @@
 
 import bpy
 import os
+import time
+import queue
+import threading
+from bpy.app.handlers import persistent
 from bpy.types import PropertyGroup, Operator
-from bpy.props import StringProperty, BoolProperty, CollectionProperty, IntProperty, EnumProperty, PointerProperty
+from bpy.props import StringProperty, BoolProperty, CollectionProperty, IntProperty, FloatProperty, EnumProperty, PointerProperty
 
 
 from . import preferences
+from .core import naming
+from .core import listdiff
 
-import re
-from collections import defaultdict
 from pathlib import Path
 
 from .utils import LoggerFactory, PathUtils
+from .core.shot_context import ShotContext
+from .core.scanner import ScanIndex
+from .core.versions import VersionIndex
+from .core.profiling import Profiler
 
 logger = LoggerFactory.get_logger()
 
-class ScanForAlembicFiles(Operator):
-    bl_idname = "object.scan_for_alembic_files"
-    bl_label = "Scan for Blend Files"
+class ScanResults:
+    """
+    The raw result of the last directory scan, kept in memory apart from the abc_files
+    collection so the list filters can be re-applied without walking the disk again.
+    """
+    directory = None
+    files = []
+    # the same files, for membership tests
+    paths = set()
+    version_index = VersionIndex()
+    # bumped every time abc_files is rebuilt, so anything derived from the list knows to recompute
+    generation = 0
+
+    @classmethod
+    def store(cls, directory, files):
+        cls.directory = directory
+        cls.files = list(files)
+        cls.paths = set(cls.files)
+        cls.version_index = VersionIndex(cls.files)
+        cls.prefetch_updates()
+
+    @classmethod
+    def add_file(cls, file_path):
+        """
+        Adds a single file to the last scan result. Returns False if it was already there.
+        """
+        if file_path in cls.paths:
+            return False
+        cls.files.append(file_path)
+        cls.paths.add(file_path)
+        cls.version_index.add(file_path)
+        return True
+
+    @classmethod
+    def remove_file(cls, file_path):
+        """
+        Removes a single file from the last scan result. Returns False if it wasn't there.
+        """
+        if file_path not in cls.paths:
+            return False
+        cls.files.remove(file_path)
+        cls.paths.discard(file_path)
+        cls.version_index.remove(file_path)
+        return True
+
+    @staticmethod
+    def prefetch_updates():
+        # imported here, the inventory module imports this one
+        from .inventory import CacheInventory
+        CacheInventory.prefetch_outdated()
+
+    @classmethod
+    def reparse(cls):
+        """
+        Rebuilds the version index and the list's nice names after the naming templates change.
+        """
+        cls.version_index = VersionIndex(cls.files)
+        for scene in bpy.data.scenes:
+            for item in scene.CacheAssignerProperties.abc_files:
+                item.display_name = ScanForAlembicFiles.extract_and_reorder_filename(item.name)
+        cls.touch()
+
+    @classmethod
+    def touch(cls):
+        cls.generation += 1
+
+    @classmethod
+    def clear(cls):
+        cls.directory = None
+        cls.files = []
+        cls.paths = set()
+        cls.version_index = VersionIndex()
+        cls.touch()
+
+class BackgroundScan:
+    """
+    Runs the directory walk on a worker thread and streams the files it finds through a
+    queue. A bpy.app.timers callback drains the queue on the main thread and appends the
+    files to abc_files in batches, so the UI stays responsive while a large shot is indexed.
+    """
+    BATCH_SIZE = 250
+    INTERVAL = 0.1
+
+    thread = None
+    results = None
+    cancel_event = None
+    scene_name = None
+    directory = None
+    found = []
+    started = 0.0
+    # files are only streamed into a list that shows another folder, a rescan is diffed at the end
+    streaming = False
+
+    _DONE = object()
+
+    @classmethod
+    def is_running(cls):
+        return cls.thread is not None
+
+    @classmethod
+    def start(cls, context, directory, files_iter):
+        MetadataLoader.cancel()
+        LiveRefresh.stop()
+        cls.results = queue.Queue()
+        cls.cancel_event = threading.Event()
+        cls.scene_name = context.scene.name
+        cls.directory = directory
+        cls.found = []
+        cls.started = time.perf_counter()
+
+        cls.streaming = ScanResults.directory != directory
+        if cls.streaming:
+            context.scene.CacheAssignerProperties.abc_files.clear()
+            context.scene.CacheAssignerProperties.abc_file_index = -1
+
+        cls.thread = threading.Thread(target=cls.worker, args=(files_iter, cls.results, cls.cancel_event), daemon=True)
+        cls.thread.start()
+        bpy.app.timers.register(background_scan_timer, first_interval=cls.INTERVAL)
+
+    @classmethod
+    def cancel(cls):
+        if cls.cancel_event:
+            cls.cancel_event.set()
+
+    @classmethod
+    def reset(cls):
+        """
+        Cancels the scan and forgets it without waiting for the worker, for when the timer
+        draining it is gone (a new file was loaded, or the add-on is unregistered).
+        """
+        cls.cancel()
+        if bpy.app.timers.is_registered(background_scan_timer):
+            bpy.app.timers.unregister(background_scan_timer)
+        cls.thread = None
+        cls.results = None
+        cls.found = []
+        cls.streaming = False
+
+    @classmethod
+    def worker(cls, files_iter, results, cancel_event):
+        try:
+            for file_path in files_iter:
+                if cancel_event.is_set():
+                    break
+                results.put(file_path)
+        except Exception as e:
+            logger.error('BackgroundScan - Scan failed: %s', e)
+        finally:
+            results.put(cls._DONE)
+
+    @classmethod
+    def drain(cls):
+        scene = bpy.data.scenes.get(cls.scene_name)
+        if scene is None:
+            cls.cancel()
+
+        finished = False
+        batch = []
+        while len(batch) < cls.BATCH_SIZE:
+            try:
+                file_path = cls.results.get_nowait()
+            except queue.Empty:
+                break
+            if file_path is cls._DONE:
+                finished = True
+                break
+            batch.append(file_path)
+
+        cls.found.extend(batch)
+        if scene is not None and cls.streaming:
+            abc_files = scene.CacheAssignerProperties.abc_files
+            for file_path in batch:
+                ScanForAlembicFiles.fill_item(abc_files.add(), file_path)
+
+        if batch and cls.streaming:
+            ScanResults.touch()
+        tag_properties_redraw()
+
+        if not finished:
+            return cls.INTERVAL
+
+        cancelled = cls.cancel_event.is_set()
+        cls.thread.join()
+        cls.thread = None
+
+        if cancelled:
+            logger.info('BackgroundScan - Cancelled after %d files', len(cls.found))
+        else:
+            ScanResults.store(cls.directory, cls.found)
+            if scene is not None:
+                # apply the list filters now the full set of files is known
+                ScanForAlembicFiles.populate_abc_files(scene)
+                LiveRefresh.start(scene)
+            logger.info('BackgroundScan - Finished, %d files', len(cls.found))
+            if Profiler.enabled:
+                Profiler.record("scan.background", cls.started, time.perf_counter() - cls.started, len(cls.found))
+
+        cls.found = []
+        tag_properties_redraw()
+        return None
+
+class MetadataLoader:
+    """
+    Fills the metadata fields of abc_files in the background. A worker thread reads each
+    file's metadata through the MetadataCache (headers are only read for files the cache
+    hasn't seen at that size and mtime) and a timer copies the results onto the list items,
+    so the list never touches the network while it draws.
+    """
+    BATCH_SIZE = 250
+    INTERVAL = 0.2
+
+    cache = None
+    thread = None
+    results = None
+    cancel_event = None
+    scene_name = None
+    generation = None
+    indices = {}
+
+    _DONE = object()
+
+    @classmethod
+    def get_cache(cls):
+        # imported when first needed, so registering the add-on stays quick
+        from .core.metadata import MetadataCache
+
+        prefs = preferences.get(bpy.context)
+        if cls.cache is None:
+            cls.cache = MetadataCache(preferences.get_cache_dir(bpy.context), prefs.metadata_cache_size)
+            cls.cache.load()
+        cls.cache.max_entries = prefs.metadata_cache_size
+        return cls.cache
+
+    @classmethod
+    def start(cls, scene):
+        cls.cancel()
+
+        cacheProps = scene.CacheAssignerProperties
+        # items kept across a refresh already have their details
+        cls.indices = {item.path: i for i, item in enumerate(cacheProps.abc_files) if not item.has_metadata}
+        if not cls.indices:
+            return
+
+        cls.results = queue.Queue()
+        cls.cancel_event = threading.Event()
+        cls.scene_name = scene.name
+        cls.generation = ScanResults.generation
+        cls.thread = threading.Thread(target=cls.worker, args=(list(cls.indices), cls.get_cache(), cls.results, cls.cancel_event), daemon=True)
+        cls.thread.start()
+        if not bpy.app.timers.is_registered(metadata_loader_timer):
+            bpy.app.timers.register(metadata_loader_timer, first_interval=cls.INTERVAL)
+
+    @classmethod
+    def cancel(cls):
+        if cls.cancel_event:
+            cls.cancel_event.set()
+        cls.thread = None
+
+    @classmethod
+    def worker(cls, paths, cache, results, cancel_event):
+        from .core import archive
 
-    def extract_and_reorder_filename(self, filename):
         try:
-            # Regex pattern to capture parts of the filename
-            pattern = re.compile(r"(3d_anim|3d_layout)_(.*?)_3d_rigging.*__(v\d{3})\.")
+            for path in paths:
+                if cancel_event.is_set():
+                    break
+                try:
+                    with Profiler.stage("metadata.read", 1):
+                        entry = cache.get(path)
+                    results.put((path, entry))
+                except (OSError, archive.AlembicReadError) as e:
+                    logger.debug('MetadataLoader - Could not read %s: %s', path, e)
+            cache.save()
+        except Exception as e:
+            logger.error('MetadataLoader - Stopped: %s', e)
+        finally:
+            # the timer polls until it sees this
+            results.put(cls._DONE)
+
+    @classmethod
+    def drain(cls):
+        scene = bpy.data.scenes.get(cls.scene_name)
+        if cls.thread is None or scene is None or ScanResults.generation != cls.generation:
+            # the list has been rebuilt or the loader restarted, these results are stale
+            cls.cancel()
+            return None
+
+        cacheProps = scene.CacheAssignerProperties
+        render = scene.render
+        fps = render.fps / render.fps_base
+
+        finished = False
+        for _ in range(cls.BATCH_SIZE):
+            try:
+                result = cls.results.get_nowait()
+            except queue.Empty:
+                break
+            if result is cls._DONE:
+                finished = True
+                break
+
+            path, entry = result
+            index = cls.indices.get(path)
+            if index is None:
+                continue
+            cls.apply(cacheProps.abc_files[index], entry, fps)
+
+        tag_properties_redraw()
+        if finished:
+            cls.thread = None
+            return None
+        return cls.INTERVAL
+
+    @staticmethod
+    def apply(item, entry, fps):
+        time_range = entry["time_range"]
+        item.is_static = time_range is None
+        if time_range:
+            item.frame_start = time_range[0] * fps
+            item.frame_end = time_range[1] * fps
+        item.object_count = entry["object_count"]
+        item.file_size_mb = entry["size"] / (1024 * 1024)
+        item.publish_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["publish_time"]))
+        item.has_metadata = True
+
+class LiveRefresh:
+    """
+    Keeps the last scan result up to date after a scan has finished. A watcher (see watcher.py)
+    reports files added to or removed from the publish folder, and a timer applies just those
+    changes to ScanResults and diffs them into abc_files, so new publishes show up and the "new animation"
+    banner updates without another scan.
+    """
+    BATCH_SIZE = 250
+    INTERVAL = 1.0
 
-            # Match the pattern in the filename
-            match = pattern.search(filename)
-            if not match:
-                return filename
+    watcher = None
+    events = None
+    scene_name = None
+    directory = None
+    rescan_thread = None
 
-            # Extract parts from the regex groups
-            task_name = match.group(1)
-            asset_name = match.group(2)
-            version = match.group(3)
-            extension = filename.rsplit('.', 1)[1]
+    @classmethod
+    def is_running(cls):
+        return cls.watcher is not None
 
+    @classmethod
+    def start(cls, scene):
+        cls.stop()
 
-            # Extract the type (animation, layout, etc.) before 3d_anim_
-            type_match = re.search(r"tre_sh\d+_(.*?)_(3d_anim|3d_layout)_", filename)
-            if not type_match:
-                return filename
-            
-            type_name = type_match.group(1)
+        context = bpy.context
+        prefs = preferences.get(context)
+        if not prefs.watch_publish_folder or ScanResults.directory is None:
+            return
 
-            # Extract the item number before the version
-            item_number_match = re.search(r"_(\d{2})__", filename)
-            if not item_number_match:
-                return filename
+        # the inotify and polling code is only loaded once watching is switched on
+        from .core import watcher
 
-            item_number = item_number_match.group(1)
+        cls.scene_name = scene.name
+        cls.directory = ScanResults.directory
+        try:
+            cls.watcher, cls.events = watcher.create_watcher(
+                cls.directory,
+                preferences.get_cache_dir(context),
+                mode=prefs.watch_mode,
+                known_files=ScanResults.files,
+                interval=prefs.watch_interval,
+                walker=preferences.get_walker(context),
+            )
+        except OSError as e:
+            logger.warning('LiveRefresh - Could not watch %s: %s', cls.directory, e)
+            cls.watcher = None
+            return
+
+        if not bpy.app.timers.is_registered(live_refresh_timer):
+            bpy.app.timers.register(live_refresh_timer, first_interval=cls.INTERVAL, persistent=True)
+
+    @classmethod
+    def stop(cls):
+        if cls.watcher is not None:
+            cls.watcher.stop()
+        cls.watcher = None
+        cls.events = None
+        if bpy.app.timers.is_registered(live_refresh_timer):
+            bpy.app.timers.unregister(live_refresh_timer)
+
+    @classmethod
+    def rescan(cls):
+        """
+        Finds what changed while the watcher lost track, with an incremental scan index walk
+        on a worker thread. The differences are queued as ordinary events.
+        """
+        if cls.rescan_thread is not None and cls.rescan_thread.is_alive():
+            return
+
+        context = bpy.context
+        scan_index = ScanIndex(cls.directory, preferences.get_cache_dir(context), walker=preferences.get_walker(context))
+        known = {str(path) for path in ScanResults.files}
+        cls.rescan_thread = threading.Thread(target=cls.rescan_worker, args=(scan_index, known, cls.events), daemon=True)
+        cls.rescan_thread.start()
+
+    @staticmethod
+    def rescan_worker(scan_index, known, events):
+        from .core import watcher
 
-            # Create the new string
-            new_string = f"{task_name}_{asset_name}_{item_number}_{type_name}_{version}.{extension}"
+        try:
+            current = {str(path) for path in scan_index.scan()}
+        except Exception as e:
+            logger.error('LiveRefresh - Rescan of %s failed: %s', scan_index.root, e)
+            return
+        for path in current - known:
+            events.put((watcher.ADDED, path))
+        for path in known - current:
+            events.put((watcher.REMOVED, path))
+
+    @classmethod
+    def drain(cls):
+        from .core import watcher
+
+        scene = bpy.data.scenes.get(cls.scene_name)
+        if cls.watcher is None or scene is None or ScanResults.directory != cls.directory:
+            # the scene is gone or the list now shows another scan
+            cls.stop()
+            return None
+
+        added = []
+        removed = []
+        for _ in range(cls.BATCH_SIZE):
+            try:
+                event, path = cls.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event == watcher.RESCAN:
+                cls.rescan()
+                continue
+
+            file_path = Path(path)
+            if event == watcher.ADDED and ScanResults.add_file(file_path):
+                added.append(file_path)
+            elif event == watcher.REMOVED and ScanResults.remove_file(file_path):
+                removed.append(file_path)
+
+        if added or removed:
+            logger.info('LiveRefresh - %d caches published, %d removed in %s', len(added), len(removed), cls.directory)
+            ScanForAlembicFiles.populate_abc_files(scene)
+            if added:
+                ScanResults.prefetch_updates()
+            tag_properties_redraw()
+        return cls.INTERVAL
+
+class CachePrefetch:
+    """
+    Warms the newer versions of loaded caches in the background, as the artist is likely to
+    load them next. See prefetch.Prefetcher.
+    """
+    prefetcher = None
+
+    @staticmethod
+    def is_enabled():
+        return preferences.get(bpy.context).prefetch_newer_versions
+
+    @classmethod
+    def request(cls, paths):
+        prefs = preferences.get(bpy.context)
+        if not prefs.prefetch_newer_versions or not paths:
+            return
+
+        rate = int(prefs.prefetch_bandwidth * 1024 * 1024)
+        if cls.prefetcher is None:
+            from .core.prefetch import Prefetcher
+            cls.prefetcher = Prefetcher(rate)
+        cls.prefetcher.set_rate(rate)
+        cls.prefetcher.request(paths)
+
+    @classmethod
+    def stop(cls):
+        if cls.prefetcher is not None:
+            cls.prefetcher.stop()
+        cls.prefetcher = None
+
+def live_refresh_timer():
+    return LiveRefresh.drain()
+
+def metadata_loader_timer():
+    return MetadataLoader.drain()
+
+def background_scan_timer():
+    return BackgroundScan.drain()
+
+def tag_properties_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
 
-            logger.info (f'NICE NAME {match.groups()} {asset_name} {item_number} {version} {extension}')
+class ScanForAlembicFiles(Operator):
+    bl_idname = "object.scan_for_alembic_files"
+    bl_label = "Scan for Blend Files"
 
+    full_rescan : BoolProperty(
+        name="Full Rescan",
+        description="Ignore the scan index and list every publish folder again",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
 
-            return new_string
-        except Exception as e:
-            # In case of any unexpected error, return the original filename
-            return filename
-
-    def get_latest_versions(self,files):
-        file_dict = defaultdict(list)
-        
-        # Regular expression to capture the filename and version number
-        pattern = re.compile(r"^(.*?)(v\d{3})$")
-
-        for file_path in files:
-            match = pattern.search(file_path.stem)
-            if match:
-                base_name = match.group(1)
-                version = match.group(2)
-                file_dict[base_name].append((version, file_path))
-        
-        latest_files = []
-        for base_name, versions in file_dict.items():
-            latest_version = max(versions, key=lambda x: int(x[0][1:]))
-            latest_files.append(latest_version[1])
-        
-        return latest_files
+    @staticmethod
+    def extract_and_reorder_filename(filename):
+        return naming.nice_name(filename)
+
+    @staticmethod
+    def get_latest_versions(files):
+        return VersionIndex(files).latest_paths()
     
-    def scan_for_abc_files(self, directory, context):
+    def iter_abc_files(self, directory, context):
+        prefs = preferences.get(context)
+        walker = preferences.get_walker(context)
+        if prefs.use_scan_index:
+            scan_index = ScanIndex(directory, preferences.get_cache_dir(context), walker=walker)
+            return scan_index.iter_scan(full_rescan=self.full_rescan)
+        else:
+            return walker.iter_files(directory)
 
-        lookProps = context.scene.CacheAssignerProperties
-        lookProps.abc_files.clear()
+    def scan_for_abc_files(self, directory, context):
+        LiveRefresh.stop()
+
+        with Profiler.stage("scan") as stage:
+            all_files = list(self.iter_abc_files(directory, context))
+            stage.items = len(all_files)
+
+        ScanResults.store(directory, all_files)
+        self.populate_abc_files(context.scene)
+        LiveRefresh.start(context.scene)
+
+    @classmethod
+    def fill_item(cls, item, file_path):
+        # the nice name is always stored, the list picks which name to show when it draws
+        item.name = file_path.name
+        item.display_name = cls.extract_and_reorder_filename(file_path.name)
+        item.path = str(file_path)
+
+    @classmethod
+    def populate_abc_files(cls, scene):
+        """
+        Brings the abc_files collection in line with the in-memory scan result and the
+        latest version filter. Only the items that differ are added or removed, and the
+        selected file stays selected if it is still listed. Never touches the disk.
+        """
+        lookProps = scene.CacheAssignerProperties
+        abc_files = lookProps.abc_files
+
+        selected = None
+        if 0 <= lookProps.abc_file_index < len(abc_files):
+            selected = abc_files[lookProps.abc_file_index].path
 
-        directory_path = Path(directory)
-        all_files = list(directory_path.rglob("*.abc"))
-        
         if lookProps.latest_files_only:
-            files_to_process = self.get_latest_versions(all_files)
+            files_to_process = ScanResults.version_index.latest_paths()
         else:
-            files_to_process = all_files
-        
-        for file_path in files_to_process:
-            logger.debug(f'ScanForAlembicFiles - File Found: {file_path.parent} {file_path.name}')
-
-            if lookProps.nice_name:
-                display_name = self.extract_and_reorder_filename(file_path.name) 
-            else:
-                display_name = file_path.name
-
-            item = lookProps.abc_files.add()
-            item.name = file_path.name
-            item.display_name = display_name
-            item.path = str(file_path)
-            
-        lookProps.abc_file_index = -1
+            files_to_process = ScanResults.files
+
+        with Profiler.stage("list.populate") as stage:
+            added, removed = listdiff.sync_items(abc_files, files_to_process, cls.fill_item)
+            stage.items = added + removed
+        logger.debug('ScanForAlembicFiles - %d caches added to the list, %d removed', added, removed)
+
+        index = listdiff.index_of(abc_files, selected)
+        if index != lookProps.abc_file_index:
+            lookProps.abc_file_index = index
+        ScanResults.touch()
+
+        if preferences.get(bpy.context).load_metadata:
+            MetadataLoader.start(scene)
 
     def execute(self, context):
         prefs =  preferences.get(context) 
         lookProps = context.scene.CacheAssignerProperties  
-        selected_path = PathUtils.get_anim_from_shot_context(self)
-        self.scan_for_abc_files(selected_path, context)
+        selected_path = ShotContext.get().anim_dir
+        if not selected_path:
+            self.report({'ERROR'}, "No shot context found. Open this file from OpenPype/Ayon so AVALON_WORKDIR is set.")
+            return {'CANCELLED'}
+
+        if BackgroundScan.is_running():
+            self.report({'WARNING'}, "A cache scan is already running.")
+            return {'CANCELLED'}
+
+        if prefs.background_scan:
+            BackgroundScan.start(context, selected_path, self.iter_abc_files(selected_path, context))
+        else:
+            self.scan_for_abc_files(selected_path, context)
 
         return {'FINISHED'}
 
+class CancelAlembicScan(Operator):
+    """Stop the running cache scan"""
+    bl_idname = "object.cancel_alembic_scan"
+    bl_label = "Cancel Scan"
+
+    @classmethod
+    def poll(cls, context):
+        return BackgroundScan.is_running()
+
+    def execute(self, context):
+        BackgroundScan.cancel()
+        return {'FINISHED'}
+
+class CachePreview:
+    """
+    Object count and frame range of the highlighted cache, read from the archive headers
+    when the selection changes so the panel can show them without reading anything at draw time.
+    """
+    path = None
+    object_count = 0
+    frame_range = None
+    error = None
+
+    @classmethod
+    def update(cls, path, fps):
+        from .core import archive
+
+        cls.path = path
+        cls.object_count = 0
+        cls.frame_range = None
+        cls.error = None
+        try:
+            summary = archive.inspect(path, fps)
+        except (OSError, archive.AlembicReadError) as e:
+            cls.error = str(e)
+            logger.debug('CachePreview - Could not inspect %s: %s', path, e)
+            return
+
+        cls.object_count = len(summary["object_paths"])
+        cls.frame_range = summary["frame_range"]
+
 def alembic_item_clicked (self,context):
     """
     handler here just in case the UI needed to do anything when the file is highlighted
@@ -125,16 +664,34 @@ def alembic_item_clicked (self,context):
     abc_file_index = cacheProps.abc_file_index
     if abc_file_index >= 0 and abc_file_index < len(cacheProps.abc_files):
         abc_file_path = cacheProps.abc_files[abc_file_index].path
-        logger.debug (f'abc File clicked - {abc_file_path}')
-
-def update_alembic_list( self, context):
-    bpy.ops.object.scan_for_alembic_files()
+        logger.debug('abc File clicked - %s', abc_file_path)
+        render = context.scene.render
+        CachePreview.update(abc_file_path, render.fps / render.fps_base)
+
+def update_latest_files_only(self, context):
+    # only changes which of the known files are listed, so it never goes back to the disk
+    if BackgroundScan.is_running():
+        # applied when the scan finishes
+        return
+    if ScanResults.directory is None:
+        # nothing scanned since the file was opened, filter the list that was saved with it
+        ScanResults.store(self.task_root, [Path(item.path) for item in self.abc_files])
+    ScanForAlembicFiles.populate_abc_files(context.scene)
 
 class AlembicFileItem(PropertyGroup):
     name: StringProperty(name="File Name",default="")
     display_name: StringProperty(name="Display Name",default="")
     path: StringProperty(name="File Path",default="")
 
+    # filled in the background from the metadata cache
+    has_metadata: BoolProperty(name="Has Metadata", default=False)
+    frame_start: FloatProperty(name="Start Frame", default=0.0)
+    frame_end: FloatProperty(name="End Frame", default=0.0)
+    is_static: BoolProperty(name="Static", default=False)
+    object_count: IntProperty(name="Object Count", default=0)
+    file_size_mb: FloatProperty(name="File Size (MB)", default=0.0)
+    publish_time: StringProperty(name="Publish Time", default="")
+
 class CacheAssignerProperties(PropertyGroup):
     abc_files : CollectionProperty(type=AlembicFileItem )
 
@@ -142,9 +699,10 @@ class CacheAssignerProperties(PropertyGroup):
     # highest_version : IntProperty(name="The current highest version of the caches", default=0 )
 
     # nice_name : BoolProperty(name="Nice Name", default=False)
-    nice_name : BoolProperty(name="Nice Name", default=False, update=update_alembic_list)
+    # draw_item picks display_name or name, so the list doesn't change
+    nice_name : BoolProperty(name="Nice Name", default=False)
 
-    latest_files_only : BoolProperty(name="Latest Files Only", default=False, update=update_alembic_list)
+    latest_files_only : BoolProperty(name="Latest Files Only", default=False, update=update_latest_files_only)
     task_root : StringProperty(name="Context Path", default="", get=PathUtils.get_anim_from_shot_context)
 
     asset_name : StringProperty(
@@ -177,8 +735,33 @@ class CacheAssignerProperties(PropertyGroup):
 
 
 
+@persistent
+def shot_context_load_post(*args):
+    # a workfile opened from the pipeline comes with its own environment
+    ShotContext.invalidate()
+    logger.debug('Shot context - %s', ShotContext.get())
+    # the new shot may belong to a project with its own naming templates
+    preferences.get(bpy.context).update_naming()
+
+@persistent
+def background_scan_load_post(*args):
+    # loading a file removes the non persistent scan timer, so the scan would never finish
+    if BackgroundScan.is_running():
+        logger.info('BackgroundScan - Cancelled, a new file was loaded')
+    BackgroundScan.reset()
+
+@persistent
+def live_refresh_load_post(*args):
+    # the watched folder and the last scan belong to the previous file's shot
+    LiveRefresh.stop()
+    ScanResults.clear()
+
 def register():
+    bpy.app.handlers.load_post.append(shot_context_load_post)
+    bpy.app.handlers.load_post.append(background_scan_load_post)
+    bpy.app.handlers.load_post.append(live_refresh_load_post)
     bpy.utils.register_class(ScanForAlembicFiles)
+    bpy.utils.register_class(CancelAlembicScan)
     bpy.utils.register_class(AlembicFileItem)
     bpy.utils.register_class(CacheAssignerProperties)
     bpy.types.Scene.CacheAssignerProperties = PointerProperty(type=CacheAssignerProperties)
@@ -186,11 +769,22 @@ def register():
 
 
 def unregister():
+    CachePrefetch.stop()
+    for handler in (shot_context_load_post, background_scan_load_post, live_refresh_load_post):
+        if handler in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(handler)
+    LiveRefresh.stop()
+    BackgroundScan.reset()
+    MetadataLoader.cancel()
+    if bpy.app.timers.is_registered(metadata_loader_timer):
+        bpy.app.timers.unregister(metadata_loader_timer)
     
     bpy.utils.unregister_class(ScanForAlembicFiles)
+    bpy.utils.unregister_class(CancelAlembicScan)
     bpy.utils.unregister_class(AlembicFileItem)
     bpy.utils.unregister_class(CacheAssignerProperties)
     del bpy.types.Scene.CacheAssignerProperties
+    ScanResults.clear()
 
 
 
@@ -1,18 +1,62 @@
 import bpy
-from . import bl_info
 from bpy.types import Panel, UIList, Operator
+from bpy.props import IntProperty, EnumProperty
 
 from . import preferences
-import re
-from pathlib import Path
-from .utils import LoggerFactory, VersionChecker
-
-from collections import defaultdict
+from .utils import LoggerFactory
+from .properties import BackgroundScan, ScanResults, CachePreview
+from .core.versions import VersionIndex
+from .core.search import SearchIndex
+from .inventory import CacheInventory
+from .core.profiling import Profiler
 
 logger = LoggerFactory.get_logger()
 
+class VersionStatus:
+    """
+    Memo of the "is newer animation available" check. draw() only reads it, the check itself
+    runs again only when the cache list is rebuilt or the loaded cache file path changes.
+    """
+    key = None
+    current_version = None
+    latest_version = None
+    is_outdated = False
+
+    @classmethod
+    def get(cls, scene, cache_file):
+        cacheProps = scene.CacheAssignerProperties
+        entry = CacheInventory.get(cache_file) if cache_file else None
+        key = (scene.name, ScanResults.generation, len(cacheProps.abc_files), CacheInventory.generation, entry)
+        if key != cls.key:
+            cls.key = key
+            cls.update(cacheProps, entry[2] if entry else None)
+        return cls
+
+    @classmethod
+    def update(cls, cacheProps, current):
+        cls.current_version = None
+        cls.latest_version = None
+        cls.is_outdated = False
+
+        if current is None:
+            return
+
+        cls.current_version = current.version
+
+        version_index = ScanResults.version_index
+        if not version_index:
+            # a list saved with the .blend file hasn't been scanned in this session
+            version_index = VersionIndex(item.path for item in cacheProps.abc_files)
+
+        latest = version_index.latest(current.base_name)
+        if latest:
+            cls.latest_version = latest[0]
+        cls.is_outdated = cls.latest_version is not None and cls.latest_version > cls.current_version
+        logger.debug('VersionStatus - %s loaded, latest version %s', current.filename, cls.latest_version, extra={"rate_limit": 5.0})
+
 class AlembicFilePanel(Panel):
-    bl_label = f"The Line - Cache Assigner v{bl_info['version'][0]}.{bl_info['version'][1]}.{bl_info['version'][2]}"
+    # the version is added from bl_info when the add-on registers
+    bl_label = "The Line - Cache Assigner"
     bl_idname = "OBJECT_PT_cache_assigner"
     bl_space_type = 'PROPERTIES'
     bl_region_type = 'WINDOW'
@@ -30,69 +74,24 @@ class AlembicFilePanel(Panel):
         split.label(text=text , icon=icon)
         split.label(text=label)
 
-    def extract_version(self, filename):
-        # This regex pattern will match the 2 or 3-digit version number at the end of the filename or the parent folder
-        version_pattern = r'_v(\d{3})\.abc$'
-        match = re.search(version_pattern, filename)
-        if match:
-            return int(match.group(1))
-        else:
-            raise ValueError("No version found in filename")
-        
-    def get_latest_versions(self, files):
-        file_dict = defaultdict(list)        
-        # Regular expression to capture the filename and version number
-        pattern = re.compile(r"^(.*?)(v\d{3})\.abc$")
-        for file_path in files:
-            match = pattern.search(file_path)
-            if match:
-                base_name = match.group(1)
-                version = match.group(2)
-                file_dict[base_name].append((version, file_path))
-        
-        latest_files = []
-        for base_name, versions in file_dict.items():
-            latest_version = max(versions, key=lambda x: int(x[0][1:]))
-            latest_files.append(latest_version[1])
-        return latest_files
-    
-    def find_pattern_in_list(self, pattern, string_list):
-        for string in string_list:
-            if pattern in string:
-                return string
-        return None
-
-    def get_current_alembic_file (self):
-        selObj = bpy.context.object
+    def get_current_cache_file(self, context):
+        selObj = context.object
 
         if selObj:
-            abcDataBlock = None  
-            if 'MeshSequenceCache' in selObj.modifiers:
-                if selObj.modifiers['MeshSequenceCache'].cache_file:
-                    abcDataBlock = selObj.modifiers['MeshSequenceCache'].cache_file.name
-                else:
-                    logger.debug("I couldn't find a datablock to remap the sequence cache. Make sure you have loaded an Alembic file.")
-            else:
-                logger.debug( "I couldn't find a Mesh sequence cache modifier. Please add one and load a base file to continue...")
-
-            if abcDataBlock: 
-                # get the alembic file from the datablock name   
-                abcFile = bpy.data.cache_files[abcDataBlock]
-                # get the abc filepath                
-                # logger.debug( f'Current Alembic File = {abcFile.filepath}')
-
-                path_data = Path(abcFile.filepath)
-                file_data = {}
-                file_data["name"] = path_data.name
-                file_data["full_path"] = path_data.parent
-                file_data["version"] = self.extract_version(path_data.name)
-
-                return file_data
+            modifier = selObj.modifiers.get('MeshSequenceCache')
+            if modifier and modifier.cache_file:
+                return modifier.cache_file
+        return None
         
     def draw(self, context):
+        # not @Profiler.timed, Blender checks the argument count of a registered draw function
+        with Profiler.stage("panel.draw"):
+            self.draw_panel(context)
+
+    def draw_panel(self, context):
 
         cacheProps = context.scene.CacheAssignerProperties
-        current_cache_file = self.get_current_alembic_file()
+        status = VersionStatus.get(context.scene, self.get_current_cache_file(context))
 
         layout = self.layout
 
@@ -104,39 +103,20 @@ class AlembicFilePanel(Panel):
         message = None
         icon_status = "INFO"
 
-        try:
-            if cacheProps.abc_files:
-                if current_cache_file:
-                    filtered_paths = [item.name for item in cacheProps.abc_files.values()]       
-                    latest_version_caches = self.get_latest_versions(filtered_paths)
-                    logger.debug(f'latest_version_caches {latest_version_caches}')
-                    base_filename_pattern = r'(.+)_v\d{2,3}\.abc$'
-                    base_match = re.match(base_filename_pattern, current_cache_file['name'])
-
-                    icon_status = "INFO"
-                    icon_colour = "SEQUENCE_COLOR_04"
-                    message = f"You have the most up-to-date animation loaded."
-                    
-                    if base_match and base_match.group(1):
-                        base_filename = base_match.group(1)
-                        logger.debug(f'base_filename {base_filename}')
-                        matching_cache = self.find_pattern_in_list(base_filename , latest_version_caches)
-                        logger.debug(f'matching_cache {matching_cache}')
-                        if matching_cache:
-                            latest_version = self.extract_version(matching_cache)
-                            logger.debug(f'latest_version is {latest_version}')
-
-                            if latest_version > current_cache_file['version']:
-                                icon_status = "ERROR"
-                                icon_colour = "SEQUENCE_COLOR_01"
-                                message = f"There is new animation present for this asset. Latest Cache : v{latest_version:03}:"
-                    
-                    grid.label(text=f"Loaded Version : v{current_cache_file['version']:03}", icon=icon_colour)
-            else:
-                message = "Click the button below to view the available cache files."
+        if cacheProps.abc_files:
+            if status.current_version is not None:
+                icon_status = "INFO"
+                icon_colour = "SEQUENCE_COLOR_04"
+                message = f"You have the most up-to-date animation loaded."
+
+                if status.is_outdated:
+                    icon_status = "ERROR"
+                    icon_colour = "SEQUENCE_COLOR_01"
+                    message = f"There is new animation present for this asset. Latest Cache : v{status.latest_version:03}:"
 
-        except Exception as e:
-            logger.debug(f'Caught Exception in Draw Function {e}')
+                grid.label(text=f"Loaded Version : v{status.current_version:03}", icon=icon_colour)
+        else:
+            message = "Click the button below to view the available cache files."
             
         box = layout.box()
 
@@ -144,9 +124,15 @@ class AlembicFilePanel(Panel):
             col = box.column()
             col.label(text=message, icon=icon_status)
 
-        col = box.column()
-        col.scale_y = 1.5
-        col.operator( "object.scan_for_alembic_files", text="Get Cache Files", icon="FILE_FOLDER")   
+        row = box.row(align=True)
+        row.scale_y = 1.5
+        if BackgroundScan.is_running():
+            row.label(text=f"Scanning... {len(BackgroundScan.found)} caches found", icon="SORTTIME")
+            row.operator( "object.cancel_alembic_scan", text="Cancel", icon="CANCEL")
+        else:
+            row.operator( "object.scan_for_alembic_files", text="Get Cache Files", icon="FILE_FOLDER")   
+            op = row.operator( "object.scan_for_alembic_files", text="", icon="FILE_REFRESH")
+            op.full_rescan = True
         max_rows = 6
         abc_files_count = len(cacheProps.abc_files)
         set_height = lambda number: max_rows if number > max_rows else (0 if number < 0 else number)
@@ -159,6 +145,9 @@ class AlembicFilePanel(Panel):
 
             layout.template_list("ALEMBIC_UL_FILE_LIST", "", cacheProps, "abc_files", cacheProps, "abc_file_index", type='DEFAULT', columns=1, rows=num_rows)
 
+            if 0 <= cacheProps.abc_file_index < abc_files_count and CachePreview.path == cacheProps.abc_files[cacheProps.abc_file_index].path:
+                self.draw_preview(layout)
+
             box = layout.box()
             box.label(text='Load Filters')
             grid = box.grid_flow(columns=2, align=True)   
@@ -168,15 +157,170 @@ class AlembicFilePanel(Panel):
             col = layout.column()
             col.scale_y = 1.5
             col.operator("object.load_alembic_cache_from_file", text="Load Alembic File", icon="FILE_CACHE") 
+            col.operator("object.update_outdated_caches", text="Update All Outdated Caches", icon="FILE_REFRESH")
+            col.operator("object.purge_unused_caches", text="Purge Unused Caches", icon="TRASH")
+            col.operator("object.deduplicate_cache_files", text="Deduplicate Cache Files", icon="DUPLICATE")
+
+    def draw_preview(self, layout):
+        row = layout.row()
+        if CachePreview.error:
+            row.label(text="Couldn't read the cache headers", icon='ERROR')
+            return
+        row.label(text=f"{CachePreview.object_count} objects", icon='OUTLINER_OB_GROUP_INSTANCE')
+        if CachePreview.frame_range:
+            start, end = CachePreview.frame_range
+            row.label(text=f"Frames {start:g} - {end:g}", icon='TIME')
+        else:
+            row.label(text="Static", icon='TIME')
 
     def draw_header(self, context):
         layout = self.layout
         layout.label(text="", icon='FILE_CACHE')
 
 
+class OutdatedCachesPanel(Panel):
+    bl_label = "Outdated Caches in Scene"
+    bl_idname = "OBJECT_PT_cache_assigner_outdated"
+    bl_parent_id = "OBJECT_PT_cache_assigner"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "modifier"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        self.layout.label(text=f"({len(CacheInventory.outdated())})")
+
+    def draw(self, context):
+        layout = self.layout
+        outdated = CacheInventory.outdated()
+
+        if not ScanResults.version_index:
+            layout.label(text="Get the cache files to check for newer versions.", icon='INFO')
+            return
+        if not outdated:
+            layout.label(text="Every cache file in the scene is up to date.", icon='CHECKMARK')
+            return
+
+        col = layout.column(align=True)
+        for _, name, current_version, latest_version, _ in outdated:
+            split = col.split(factor=0.7)
+            split.label(text=name, icon='FILE_CACHE')
+            split.label(text=f"v{current_version:03} -> v{latest_version:03}")
+        layout.operator("object.update_outdated_caches", text="Update All", icon="FILE_REFRESH")
+
+class PerformancePanel(Panel):
+    bl_label = "Performance"
+    bl_idname = "OBJECT_PT_cache_assigner_performance"
+    bl_parent_id = "OBJECT_PT_cache_assigner"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "modifier"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return Profiler.enabled
+
+    def draw(self, context):
+        layout = self.layout
+        rows = Profiler.summary()
+
+        if not rows:
+            layout.label(text="Nothing recorded yet.", icon='INFO')
+        else:
+            col = layout.column(align=True)
+            header = col.split(factor=0.4)
+            header.label(text="Stage")
+            header.label(text="Calls  Mean  Max  Items")
+            for name, calls, total, mean, longest, items in rows:
+                split = col.split(factor=0.4)
+                split.label(text=name)
+                split.label(text=f"{calls}  {mean * 1000:.1f}ms  {longest * 1000:.1f}ms  {items}")
+
+        row = layout.row(align=True)
+        op = row.operator("object.export_cache_assigner_performance", text="Export JSON", icon='EXPORT')
+        op.format = 'JSON'
+        op = row.operator("object.export_cache_assigner_performance", text="Export Trace", icon='EXPORT')
+        op.format = 'CHROME'
+        row.operator("object.clear_cache_assigner_performance", text="", icon='TRASH')
+
+class ListFilter:
+    """
+    Memo of the cache list's search index and of the last filter_items result. The index is
+    rebuilt only when the list changes and the filter, sort and page only when one of them
+    does, so a redraw returns the arrays as they are and Blender lays out just the rows of one page.
+    """
+    list_key = None
+    search_index = None
+    filter_key = None
+    flags = []
+    neworder = []
+    match_count = 0
+    page = 0
+    page_count = 1
+
+    @classmethod
+    def get(cls, data, propname, filter_name, sort_by, reverse, page, page_size, visible_flag):
+        abc_files = getattr(data, propname)
+        list_key = (data.as_pointer(), propname, ScanResults.generation, len(abc_files))
+        if list_key != cls.list_key:
+            cls.list_key = list_key
+            with Profiler.stage("list.search_index", len(abc_files)):
+                cls.search_index = SearchIndex(item.name for item in abc_files)
+            cls.filter_key = None
+
+        filter_key = (filter_name, sort_by, reverse, page, page_size)
+        if filter_key != cls.filter_key:
+            cls.filter_key = filter_key
+            with Profiler.stage("list.filter", len(cls.search_index)):
+                shown, cls.match_count, cls.page, cls.page_count = cls.search_index.page(filter_name, sort_by, reverse, page, page_size)
+
+            count = len(cls.search_index)
+            cls.flags = [0] * count
+            cls.neworder = [0] * count
+            position = 0
+            for i in shown:
+                cls.flags[i] = visible_flag
+                cls.neworder[i] = position
+                position += 1
+            # hidden rows still need a place in the order, after the visible ones
+            for i in range(count):
+                if not cls.flags[i]:
+                    cls.neworder[i] = position
+                    position += 1
+        return cls
+
 class ALEMBIC_UL_FILE_LIST(UIList):
     """Custom UI list to show blend files with icons"""
-    
+
+    sort_by: EnumProperty(
+        name="Sort By",
+        items=[
+            ('NAME', "Name", "Sort by file name"),
+            ('VERSION', "Version", "Sort by publish version"),
+            ('ASSET', "Asset", "Sort by asset, then version"),
+        ],
+        default='NAME'
+    )
+
+    page: IntProperty(name="Page", default=0, min=0)
+
+    def filter_items(self, context, data, propname):
+        page_size = preferences.get(context).list_page_size
+        result = ListFilter.get(data, propname, self.filter_name, self.sort_by, self.use_filter_sort_reverse, self.page, page_size, self.bitflag_filter_item)
+        return result.flags, result.neworder
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="", icon='VIEWZOOM')
+        row.prop(self, "sort_by", text="")
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+
+        row = layout.row(align=True)
+        row.label(text=f"{ListFilter.match_count} matching")
+        if ListFilter.page_count > 1:
+            row.prop(self, "page", text=f"Page (of {ListFilter.page_count})")
+
     def draw_item(self, context, layout, data, item, icon, active_data, active_property, index):
         cacheProps = context.scene.CacheAssignerProperties
        
@@ -184,17 +328,27 @@ class ALEMBIC_UL_FILE_LIST(UIList):
         display_text = abc_file.display_name if cacheProps.nice_name else abc_file.name
 
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
-            layout.label(text=display_text, icon='FILE_CACHE')
+            if abc_file.has_metadata and self.layout_type == 'DEFAULT':
+                split = layout.split(factor=0.7)
+                split.label(text=display_text, icon='FILE_CACHE')
+                frames = "static" if abc_file.is_static else f"{abc_file.frame_start:g}-{abc_file.frame_end:g}"
+                split.label(text=f"{frames}  {abc_file.file_size_mb:.0f} MB")
+            else:
+                layout.label(text=display_text, icon='FILE_CACHE')
         elif self.layout_type == 'GRID':
             layout.alignment = 'CENTER'
             layout.label(text="", icon='FILE_CACHE')
 
 class_list = [
     AlembicFilePanel,
+    OutdatedCachesPanel,
+    PerformancePanel,
     ALEMBIC_UL_FILE_LIST,
 ]
 
-def register():    
+def register(version=None):
+    if version:
+        AlembicFilePanel.bl_label = f"The Line - Cache Assigner v{'.'.join(str(part) for part in version)}"
 
     for cls in class_list:
         bpy.utils.register_class(cls)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the tests import cache_assigner.core straight from the checkout, no Blender needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
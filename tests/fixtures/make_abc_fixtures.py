@@ -0,0 +1,134 @@
+"""
+Writes the small Ogawa Alembic files the archive reader is tested against.
+
+    python tests/fixtures/make_abc_fixtures.py
+
+The files follow the layout AbcCoreOgawa writes (root group, object groups with their
+child headers, time samplings and indexed metadata), with no sample data, so they stay a
+few hundred bytes. They are committed, run this again only to change them.
+"""
+import os
+import sys
+import struct
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DATA_FLAG = 0x8000000000000000
+ACYCLIC_TIME_PER_CYCLE = sys.float_info.max / 32.0
+
+XFORM = "schema=AbcGeom_Xform_v3;schemaObjTitle=AbcGeom_Xform_v3:.xform"
+POLYMESH = "schema=AbcGeom_PolyMesh_v1;schemaBaseType=AbcGeom_GeomBase_v1;schemaObjTitle=AbcGeom_PolyMesh_v1:.geom"
+ARCHIVE_METADATA = "_ai_Application=Maya 2024 AbcExport v1.0;_ai_AlembicVersion=Alembic 1.8.5;FramesPerTimeUnit=24"
+
+# (name, metadata, children), written depth first
+HIERARCHY = [
+    ("charBob", XFORM, [
+        ("body_GEO", XFORM, [("body_GEOShape", POLYMESH, [])]),
+        ("eye_L_GEO", XFORM, [("eye_L_GEOShape", POLYMESH, [])]),
+    ]),
+    ("propSword", XFORM, [("propSword_GEOShape", POLYMESH, [])]),
+]
+
+# Alembic's identity sampling, always written first
+DEFAULT_SAMPLING = (1, 1.0, [0.0])
+
+
+class OgawaWriter:
+    """
+    Appends groups and data to an Ogawa file. Children are written before their parent, so a
+    group only ever points backwards, and the root group goes last like AbcCoreOgawa does it.
+    """
+
+    def __init__(self):
+        self.buf = bytearray(b"Ogawa" + b"\xff" + struct.pack("<H", 1) + bytes(8))
+
+    def data(self, payload):
+        if not payload:
+            return DATA_FLAG
+        pos = len(self.buf)
+        self.buf += struct.pack("<Q", len(payload)) + payload
+        return pos | DATA_FLAG
+
+    def group(self, children):
+        if not children:
+            return 0
+        pos = len(self.buf)
+        self.buf += struct.pack(f"<Q{len(children)}Q", len(children), *children)
+        return pos
+
+    def finish(self, root):
+        struct.pack_into("<Q", self.buf, 8, root)
+        return bytes(self.buf)
+
+
+def object_headers(children, indexed_metadata, corrupt=False):
+    headers = bytearray()
+    for name, metadata, _ in children:
+        name = name.encode("utf-8")
+        # claim a longer name than there is, so the headers run past the end of the data
+        headers += struct.pack("<I", len(name) * 100 if corrupt else len(name)) + name
+        if metadata in indexed_metadata:
+            headers += bytes([indexed_metadata.index(metadata)])
+        else:
+            metadata = metadata.encode("utf-8")
+            headers += b"\xff" + struct.pack("<I", len(metadata)) + metadata
+    # the data and children hashes
+    return bytes(headers) + bytes(32)
+
+
+def write_object(writer, children, indexed_metadata, corrupt=False):
+    groups = [write_object(writer, grandchildren, indexed_metadata) for _, _, grandchildren in children]
+    headers = writer.data(object_headers(children, indexed_metadata, corrupt))
+    # group 0 holds the object's own properties, left empty here
+    return writer.group([0] + groups + [headers])
+
+
+def time_samplings(samplings, corrupt=False):
+    buf = bytearray()
+    for max_samples, time_per_cycle, sample_times in samplings:
+        count = len(sample_times) + 1000 if corrupt else len(sample_times)
+        buf += struct.pack("<IdI", max_samples, time_per_cycle, count)
+        buf += struct.pack(f"<{len(sample_times)}d", *sample_times)
+    return bytes(buf)
+
+
+def write_archive(samplings, hierarchy=HIERARCHY, corrupt_headers=False, corrupt_samplings=False):
+    # index 0 is the implied empty string, the Xform metadata is shared and the shapes write theirs inline
+    indexed_metadata = ["", XFORM]
+
+    writer = OgawaWriter()
+    archive_version = writer.data(struct.pack("<i", 1))
+    file_version = writer.data(struct.pack("<i", 10805))
+    top = write_object(writer, hierarchy, indexed_metadata, corrupt_headers)
+    metadata = writer.data(ARCHIVE_METADATA.encode("utf-8"))
+    samplings = writer.data(time_samplings([DEFAULT_SAMPLING] + samplings, corrupt_samplings))
+    indexed = writer.data(b"".join(bytes([len(text)]) + text.encode("utf-8") for text in indexed_metadata[1:]))
+    return writer.finish(writer.group([archive_version, file_version, top, metadata, samplings, indexed]))
+
+
+def main():
+    # frames 1001 to 1048 at 24 fps
+    uniform = (48, 1.0 / 24.0, [1001.0 / 24.0])
+    # three samples at 1, 1.5 and 3 seconds
+    acyclic = (3, ACYCLIC_TIME_PER_CYCLE, [1.0, 1.5, 3.0])
+
+    hierarchy = write_archive([uniform])
+    fixtures = {
+        "hierarchy.abc": hierarchy,
+        "acyclic.abc": write_archive([acyclic], hierarchy=[("camera1", XFORM, [])]),
+        "static.abc": write_archive([], hierarchy=[("set", XFORM, [("ground", POLYMESH, [])])]),
+        # the root group is written last, so a cut short file loses it
+        "truncated.abc": hierarchy[:len(hierarchy) // 2],
+        "corrupt_headers.abc": write_archive([uniform], corrupt_headers=True),
+        "corrupt_samplings.abc": write_archive([uniform], corrupt_samplings=True),
+        # an HDF5 Alembic, from before Ogawa
+        "hdf5.abc": b"\x89HDF\r\n\x1a\n" + bytes(248),
+    }
+    for name, data in fixtures.items():
+        with open(os.path.join(HERE, name), "wb") as fixture:
+            fixture.write(data)
+        print(f"{name}: {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
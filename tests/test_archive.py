@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from cache_assigner.core import archive
+from cache_assigner.core.metadata import MetadataCache
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture(name):
+    return os.path.join(FIXTURES, name)
+
+
+def test_object_paths_are_depth_first():
+    summary = archive.inspect(fixture("hierarchy.abc"))
+    assert summary["object_paths"] == [
+        "/charBob",
+        "/charBob/body_GEO",
+        "/charBob/body_GEO/body_GEOShape",
+        "/charBob/eye_L_GEO",
+        "/charBob/eye_L_GEO/eye_L_GEOShape",
+        "/propSword",
+        "/propSword/propSword_GEOShape",
+    ]
+
+
+def test_schemas_from_indexed_and_inline_metadata():
+    schemas = archive.inspect(fixture("hierarchy.abc"))["schemas"]
+    assert schemas["/charBob"] == "AbcGeom_Xform_v3"
+    assert schemas["/charBob/body_GEO/body_GEOShape"] == "AbcGeom_PolyMesh_v1"
+
+
+def test_archive_metadata():
+    summary = archive.inspect(fixture("hierarchy.abc"))
+    assert summary["metadata"]["FramesPerTimeUnit"] == "24"
+    assert summary["size"] == os.path.getsize(fixture("hierarchy.abc"))
+
+
+def test_uniform_frame_range():
+    assert archive.inspect(fixture("hierarchy.abc"))["frame_range"] == (1001.0, 1048.0)
+
+
+def test_frame_range_at_another_fps():
+    assert archive.inspect(fixture("hierarchy.abc"), fps=48)["frame_range"] == (2002.0, 2096.0)
+
+
+def test_acyclic_frame_range():
+    with archive.AlembicArchive(fixture("acyclic.abc")) as abc:
+        time_sampling = abc.time_samplings[1]
+        assert time_sampling.is_acyclic
+        assert time_sampling.sample_time(1) == 1.5
+        assert abc.time_range() == (1.0, 3.0)
+        assert abc.frame_range() == (24.0, 72.0)
+
+
+def test_static_archive_has_no_frame_range():
+    summary = archive.inspect(fixture("static.abc"))
+    assert summary["object_paths"] == ["/set", "/set/ground"]
+    assert summary["frame_range"] is None
+
+
+@pytest.mark.parametrize("name", ["truncated.abc", "corrupt_headers.abc", "corrupt_samplings.abc", "hdf5.abc"])
+def test_unreadable_archives(name):
+    with pytest.raises(archive.AlembicReadError):
+        archive.inspect(fixture(name))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.abc"
+    path.write_bytes(b"")
+    with pytest.raises(archive.AlembicReadError):
+        archive.inspect(path)
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(OSError):
+        archive.inspect(tmp_path / "missing.abc")
+
+
+def test_metadata_cache_reads_headers_once(tmp_path):
+    cache = MetadataCache(tmp_path)
+    entry = cache.get(fixture("hierarchy.abc"))
+    assert entry["object_count"] == 7
+    assert entry["time_range"] == pytest.approx((1001.0 / 24.0, 1048.0 / 24.0))
+    assert cache.get(fixture("hierarchy.abc")) is entry
+
+
+def test_metadata_cache_keeps_unreadable_headers(tmp_path):
+    entry = MetadataCache(tmp_path).get(fixture("corrupt_samplings.abc"))
+    assert entry["time_range"] is None
+    assert entry["object_count"] == 0
+
+
+def test_metadata_cache_hashes_only_on_request(tmp_path):
+    cache = MetadataCache(tmp_path)
+    assert "hash" not in cache.get(fixture("hierarchy.abc"))
+    fingerprint = cache.fingerprint(fixture("hierarchy.abc"))
+    assert fingerprint == cache.get(fixture("hierarchy.abc"))["hash"]
+    assert fingerprint != cache.fingerprint(fixture("acyclic.abc"))
@@ -0,0 +1,113 @@
+import json
+import shutil
+
+from pathlib import Path
+
+import pytest
+
+from cache_assigner import batch
+from cache_assigner.core import naming
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    naming.configure()
+    batch._version_indices.clear()
+    yield
+    naming.configure()
+    batch._version_indices.clear()
+
+
+def publish(root, filename, fixture="hierarchy.abc"):
+    path = root / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(FIXTURES / fixture, path)
+    return path
+
+
+def describe(path, cache_files):
+    path.write_text(json.dumps({"cache_files": cache_files}), encoding="utf-8")
+    return path
+
+
+def run(tmp_path, *args):
+    report_path = tmp_path / "report.json"
+    code = batch.main([*map(str, args), "--report", str(report_path), "--index-dir", str(tmp_path / "index")])
+    return code, json.loads(report_path.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def publish_dir(tmp_path):
+    root = tmp_path / "publish" / "animation"
+    publish(root, "charBob/v001/charBob_cache_v001.abc")
+    publish(root, "charBob/v002/charBob_cache_v002.abc")
+    publish(root, "propSword/v001/propSword_cache_v001.abc", "static.abc")
+    return root
+
+
+def test_retargets_to_the_latest_version(tmp_path, publish_dir):
+    scene = describe(tmp_path / "lighting.json", [
+        {"name": "charBob.abc", "filepath": str(publish_dir / "charBob/v001/charBob_cache_v001.abc"), "objects": ["body_GEO", "hat_GEO"]},
+        {"name": "propSword.abc", "filepath": str(publish_dir / "propSword/v001/propSword_cache_v001.abc")},
+    ])
+
+    code, report = run(tmp_path, scene, "--publish-dir", publish_dir)
+
+    assert code == 0
+    assert (report["files"], report["failed"], report["cache_files_updated"]) == (1, 0, 1)
+    change, = report["reports"][0]["changes"]
+    assert (change["cache_file"], change["old_version"], change["new_version"]) == ("charBob.abc", 1, 2)
+    # a mesh modifier reads the shape under the transform
+    assert change["objects"]["matched"] == {"body_GEO": "/charBob/body_GEO/body_GEOShape"}
+    assert change["objects"]["unmatched"] == ["hat_GEO"]
+
+    saved = json.loads(scene.read_text(encoding="utf-8"))
+    assert saved["cache_files"][0]["filepath"] == str(publish_dir / "charBob/v002/charBob_cache_v002.abc")
+    assert saved["cache_files"][1]["filepath"] == str(publish_dir / "propSword/v001/propSword_cache_v001.abc")
+
+
+def test_no_save_leaves_the_description(tmp_path, publish_dir):
+    old_path = str(publish_dir / "charBob/v001/charBob_cache_v001.abc")
+    scene = describe(tmp_path / "lighting.json", [{"name": "charBob.abc", "filepath": old_path}])
+
+    code, report = run(tmp_path, scene, "--publish-dir", publish_dir, "--no-save")
+
+    assert code == 0
+    assert report["cache_files_updated"] == 1
+    assert not report["reports"][0]["saved"]
+    assert json.loads(scene.read_text(encoding="utf-8"))["cache_files"][0]["filepath"] == old_path
+
+
+def test_linked_cache_files_are_left_alone(tmp_path, publish_dir):
+    scene = describe(tmp_path / "lighting.json", [
+        {"name": "charBob.abc", "filepath": str(publish_dir / "charBob/v001/charBob_cache_v001.abc"), "linked": True},
+    ])
+    code, report = run(tmp_path, scene, "--publish-dir", publish_dir)
+    assert code == 0
+    assert report["cache_files_updated"] == 0
+
+
+def test_naming_templates(tmp_path):
+    # versions this project writes as .r001, which the default templates don't know
+    root = tmp_path / "publish" / "animation"
+    publish(root, "charBob/charBob.r001.abc")
+    publish(root, "charBob/charBob.r004.abc")
+    scene = describe(tmp_path / "lighting.json", [{"name": "charBob.abc", "filepath": str(root / "charBob/charBob.r001.abc")}])
+
+    _, report = run(tmp_path, scene, "--publish-dir", root, "--no-save")
+    assert report["cache_files_updated"] == 0
+
+    batch._version_indices.clear()
+    _, report = run(tmp_path, scene, "--publish-dir", root, "--no-save", "--naming-templates", "{asset}.r{version:03d}.{extension}")
+    assert report["cache_files_updated"] == 1
+    assert report["reports"][0]["changes"][0]["new_version"] == 4
+
+
+def test_a_broken_description_is_reported(tmp_path, publish_dir):
+    scene = tmp_path / "broken.json"
+    scene.write_text("{", encoding="utf-8")
+    code, report = run(tmp_path, scene, "--publish-dir", publish_dir)
+    assert code == 1
+    assert report["reports"][0]["status"] == "error"
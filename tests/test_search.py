@@ -0,0 +1,44 @@
+import pytest
+
+from cache_assigner.core import naming
+from cache_assigner.core.search import SearchIndex
+
+
+@pytest.fixture(autouse=True)
+def default_naming():
+    naming.configure()
+
+
+@pytest.fixture
+def index():
+    return SearchIndex([f"charBob_cache_v{version:03d}.abc" for version in (3, 1, 5, 2, 4)] + ["propSword_cache_v001.abc"])
+
+
+def versions(index, indices):
+    return [index.publish_names[i].version for i in indices]
+
+
+def test_search_matches_every_word(index):
+    assert index.matches("bob v003") == [0]
+    assert len(index.matches("")) == 6
+    assert index.matches("sword") == [5]
+
+
+def test_pages_are_ascending(index):
+    shown, matches, page, page_count = index.page("bob", "VERSION", False, 0, 2)
+    assert versions(index, shown) == [1, 2]
+    assert (matches, page, page_count) == (5, 0, 3)
+    assert versions(index, index.page("bob", "VERSION", False, 2, 2)[0]) == [5]
+
+
+def test_reversed_pages_start_from_the_end_but_stay_ascending(index):
+    # Blender reverses what filter_items returns, so the page itself is not reversed here
+    assert versions(index, index.page("bob", "VERSION", True, 0, 2)[0]) == [4, 5]
+    assert versions(index, index.page("bob", "VERSION", True, 2, 2)[0]) == [1]
+    assert versions(index, index.page("bob", "VERSION", True, 0, 10)[0]) == [1, 2, 3, 4, 5]
+
+
+def test_a_page_past_the_end_shows_the_last(index):
+    shown, _, page, _ = index.page("bob", "VERSION", False, 9, 2)
+    assert page == 2
+    assert versions(index, shown) == [5]
@@ -0,0 +1,185 @@
+from pathlib import Path
+
+import pytest
+
+from cache_assigner.core import naming
+from cache_assigner.core.versions import VersionIndex, VersionChecker, find_updates
+
+PUBLISH = "tre_sh010_animationMain_3d_anim_{asset}_3d_rigging_rigMain_01__v{version:03d}.abc"
+
+
+def publish_path(asset, version, root="/proj/publish/animation"):
+    return f"{root}/{asset}/v{version:03d}/{PUBLISH.format(asset=asset, version=version)}"
+
+
+@pytest.fixture(autouse=True)
+def default_naming():
+    naming.configure()
+    yield
+    naming.configure()
+
+
+@pytest.fixture
+def files():
+    # deliberately out of order
+    return [
+        publish_path("charBob", 2),
+        publish_path("charBob", 1),
+        publish_path("charBob", 10),
+        publish_path("propSword", 1),
+        "/proj/publish/animation/notes.abc",
+    ]
+
+
+def base_name(path):
+    return naming.parse_path(path).base_name
+
+
+def test_latest(files):
+    index = VersionIndex(files)
+    assert index.latest(base_name(files[0])) == (10, publish_path("charBob", 10))
+    assert index.latest(base_name(files[3])) == (1, publish_path("propSword", 1))
+    assert index.latest("unknown") is None
+
+
+def test_unversioned_files_are_skipped(files):
+    index = VersionIndex(files)
+    assert len(index) == 4
+    assert len(index.base_names()) == 2
+
+
+def test_all_versions_are_sorted(files):
+    index = VersionIndex(files)
+    assert [version for version, _ in index.all_versions(base_name(files[0]))] == [1, 2, 10]
+
+
+def test_newer_than(files):
+    index = VersionIndex(files)
+    assert index.newer_than(publish_path("charBob", 1)) == [(2, publish_path("charBob", 2)), (10, publish_path("charBob", 10))]
+    assert index.newer_than(publish_path("charBob", 10)) == []
+    # a version that isn't in the index itself
+    assert index.newer_than(publish_path("charBob", 5)) == [(10, publish_path("charBob", 10))]
+    assert index.newer_than("notes.abc") == []
+
+
+def test_latest_paths_keep_first_seen_order(files):
+    assert VersionIndex(files).latest_paths() == [publish_path("charBob", 10), publish_path("propSword", 1)]
+
+
+def test_add_keeps_versions_sorted(files):
+    index = VersionIndex(files)
+    assert index.add(publish_path("charBob", 5))
+    assert [version for version, _ in index.all_versions(base_name(files[0]))] == [1, 2, 5, 10]
+    assert index.add(publish_path("charAlice", 1))
+    assert index.latest(base_name(publish_path("charAlice", 1)))[0] == 1
+    assert not index.add("/proj/publish/animation/readme.abc")
+
+
+def test_remove(files):
+    index = VersionIndex(files)
+    assert index.remove(publish_path("charBob", 10))
+    assert index.latest(base_name(files[0]))[0] == 2
+    assert not index.remove(publish_path("charBob", 10))
+
+    # the last version takes its base name with it
+    assert index.remove(publish_path("propSword", 1))
+    assert base_name(publish_path("propSword", 1)) not in index
+    assert not index.remove("notes.abc")
+
+
+def test_paths_keep_their_type(files):
+    index = VersionIndex(Path(path) for path in files)
+    assert index.latest(base_name(files[0]))[1] == Path(publish_path("charBob", 10))
+    assert index.remove(publish_path("charBob", 10))
+
+
+def test_find_updates(files):
+    index = VersionIndex(files)
+    caches = [
+        ("charBob.abc", publish_path("charBob", 2, root="/elsewhere")),
+        ("propSword.abc", publish_path("propSword", 1)),
+        ("unversioned.abc", "/tmp/unversioned.abc"),
+        ("charAlice.abc", publish_path("charAlice", 1)),
+    ]
+    assert find_updates(index, caches) == [("charBob.abc", 2, 10, publish_path("charBob", 10))]
+
+
+def test_compare_versions(files):
+    checker = VersionChecker(VersionIndex(files))
+    assert checker.compare_versions(PUBLISH.format(asset="charBob", version=1)) == 10
+    assert checker.compare_versions(PUBLISH.format(asset="charBob", version=10)) == 10
+    assert checker.compare_versions(PUBLISH.format(asset="charBob", version=12)) == 12
+    assert checker.compare_versions("") == "Filename not present"
+    assert checker.compare_versions("notes.abc") == "No version found in filename"
+
+
+def test_compare_versions_with_a_file_list(files):
+    checker = VersionChecker()
+    assert checker.compare_versions(PUBLISH.format(asset="charBob", version=1), files) == 10
+    assert checker.compare_versions(PUBLISH.format(asset="charBob", version=1), []) == 1
+
+
+def test_get_matched_files(files):
+    checker = VersionChecker(VersionIndex(files))
+    assert checker.get_matched_files(PUBLISH.format(asset="charBob", version=1)) == [publish_path("charBob", 2), publish_path("charBob", 10)]
+    assert checker.get_matched_files(PUBLISH.format(asset="propSword", version=1)) == []
+    assert checker.get_matched_files("notes.abc") == "Filename format is incorrect"
+
+
+def test_get_latest_versions(files):
+    assert VersionChecker().get_latest_versions(files) == [publish_path("charBob", 10), publish_path("propSword", 1)]
+
+
+@pytest.mark.parametrize("filename, base, version", [
+    ("charBob_cache_v003.abc", "charBob_cache", 3),
+    # two digit and unpadded versions are the same publish as three digit ones
+    ("charBob_cache_v03.abc", "charBob_cache", 3),
+    ("charBob_cache_v3.abc", "charBob_cache", 3),
+    ("charBob_cache_v1000.abc", "charBob_cache", 1000),
+])
+def test_fallback_template(filename, base, version):
+    publish_name = naming.parse_filename(filename)
+    assert (publish_name.base_name, publish_name.version, publish_name.extension) == (base, version, "abc")
+    assert publish_name.task is None and publish_name.asset is None
+    # nothing to reorder, the nice name is the filename
+    assert publish_name.nice_name == filename
+
+
+@pytest.mark.parametrize("filename", ["charBob_cache.abc", "v003.abc", "charBob_v001_cache.abc", ""])
+def test_names_without_a_version(filename):
+    assert naming.parse_filename(filename) is None
+    assert naming.nice_name(filename) == filename
+    with pytest.raises(ValueError):
+        naming.extract_version(filename)
+
+
+def test_full_publish_name():
+    publish_name = naming.parse_filename(PUBLISH.format(asset="charBob", version=3))
+    assert (publish_name.task, publish_name.asset, publish_name.item, publish_name.type, publish_name.version) == ("3d_anim", "charBob", 1, "animationMain", 3)
+    assert publish_name.nice_name == "3d_anim_charBob_01_animationMain_v003.abc"
+
+
+def test_versions_of_a_publish_share_a_base_name():
+    assert base_name(publish_path("charBob", 1)) == base_name(publish_path("charBob", 22))
+    assert base_name(publish_path("charBob", 1)) != base_name(publish_path("charAlice", 1))
+
+
+def test_a_task_outside_the_choices_falls_back():
+    filename = "tre_sh010_animationMain_3d_fx_charBob_3d_rigging_rigMain_01__v003.abc"
+    publish_name = naming.parse_filename(filename)
+    assert publish_name.task is None
+    assert publish_name.version == 3
+    assert publish_name.nice_name == filename
+
+
+def test_configured_templates():
+    assert naming.configure(["{asset}_{task}_v{version:03d}.{extension}"], "{asset} ({task}) v{version}")
+    assert naming.nice_name("charBob_anim_v003.abc") == "charBob (anim) v3"
+    assert not naming.configure(["{asset}_{task}_v{version:03d}.{extension}"], "{asset} ({task}) v{version}")
+    assert naming.configure()
+    assert naming.nice_name("charBob_anim_v003.abc") == "charBob_anim_v003.abc"
+
+
+def test_invalid_template():
+    with pytest.raises(ValueError):
+        naming.configure(["{asset}_{asset}_v{version:03d}.abc"])